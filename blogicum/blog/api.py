@@ -0,0 +1,259 @@
+"""JSON API только для чтения: публикации, комментарии, категории, профили.
+
+Строки выбираются через ``values()`` ровно с теми полями, которые
+запрошены в ``?fields=`` (плюс поля сортировки для курсора), и сразу
+отдаются в ``JsonResponse`` — без создания моделей и рендера шаблонов.
+Видимость публикаций та же, что и на HTML-страницах.
+"""
+from functools import wraps
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from blog.constants import (
+    API_MAX_LIMIT,
+    COMMENT_ORDERING,
+    COMMENTS_PER_PAGE,
+    FEED_ORDERING,
+    MAX_POSTS_PER_PAGE,
+)
+from blog.models import Category, Comment, Post
+from blog.paginators import CursorPaginator
+from blog.views import filter_posts, visible_posts_q
+from core.routers import replica_reads
+
+User = get_user_model()
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class NotFound(ApiError):
+    def __init__(self):
+        super().__init__("Не найдено.", HTTPStatus.NOT_FOUND)
+
+
+def image_url(name):
+    return default_storage.url(name) if name else None
+
+
+class Fields:
+    """Публичные поля ресурса: путь в ORM и, при нужде, преобразование.
+
+    ``fields`` — словарь ``имя: путь`` или ``имя: (путь, функция)``.
+    """
+
+    def __init__(self, fields, default=None):
+        self.fields = {
+            name: spec if isinstance(spec, tuple) else (spec, None)
+            for name, spec in fields.items()
+        }
+        self.default = tuple(default or self.fields)
+
+    def select(self, request):
+        """Имена полей из ``?fields=``; без параметра — поля по умолчанию."""
+        raw = request.GET.get("fields")
+        if not raw:
+            return self.default
+        names = tuple(dict.fromkeys(
+            name.strip() for name in raw.split(",") if name.strip()
+        ))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise ApiError(
+                "Неизвестные поля: {}. Доступны: {}.".format(
+                    ", ".join(unknown) or "—", ", ".join(self.fields)
+                )
+            )
+        return names
+
+    def lookups(self, names, extra=()):
+        return list(dict.fromkeys(
+            [self.fields[name][0] for name in names] + list(extra)
+        ))
+
+    def serialize(self, row, names):
+        result = {}
+        for name in names:
+            lookup, convert = self.fields[name]
+            value = row[lookup]
+            result[name] = convert(value) if convert else value
+        return result
+
+
+POST_FIELDS = Fields(
+    {
+        "id": "pk",
+        "title": "title",
+        "text": "text",
+        "pub_date": "pub_date",
+        "updated_at": "updated_at",
+        "author": "author__username",
+        "category": "category__slug",
+        "location": "location__name",
+        "comment_count": "comment_count",
+        "image": ("image", image_url),
+    },
+    default=(
+        "id", "title", "pub_date", "author", "category", "comment_count"
+    ),
+)
+COMMENT_FIELDS = Fields({
+    "id": "pk",
+    "text": "text",
+    "author": "author__username",
+    "created_at": "created_at",
+})
+CATEGORY_FIELDS = Fields({
+    "slug": "slug",
+    "title": "title",
+    "description": "description",
+})
+PROFILE_FIELDS = Fields({
+    "username": "username",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "date_joined": "date_joined",
+})
+
+
+def api_view(view):
+    """GET-представление API: ошибки и анонимы получают ответ в JSON."""
+
+    @wraps(view)
+    @require_GET
+    @replica_reads
+    def wrapper(request, *args, **kwargs):
+        try:
+            return JsonResponse(view(request, *args, **kwargs))
+        except ApiError as error:
+            return JsonResponse({"detail": str(error)}, status=error.status)
+
+    return wrapper
+
+
+def login_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            raise ApiError(
+                "Требуется авторизация.", HTTPStatus.UNAUTHORIZED
+            )
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def get_limit(request, default):
+    try:
+        limit = int(request.GET.get("limit", default))
+    except ValueError:
+        raise ApiError("limit должен быть целым числом.")
+    return max(1, min(limit, API_MAX_LIMIT))
+
+
+def page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query["cursor"] = cursor
+    return request.build_absolute_uri(f"?{query.urlencode()}")
+
+
+def paginate(request, queryset, fields, ordering, per_page):
+    """Страница по курсору из ``values()`` с полями ``?fields=``."""
+    names = fields.select(request)
+    order_fields = [name.lstrip("-") for name in ordering]
+    rows = queryset.values(*fields.lookups(names, order_fields))
+    page = CursorPaginator(
+        rows, get_limit(request, per_page), ordering=ordering
+    ).get_page(request.GET.get("cursor"))
+    return {
+        "results": [fields.serialize(row, names) for row in page],
+        "next": page_url(request, page.next_cursor),
+        "previous": page_url(request, page.previous_cursor),
+    }
+
+
+def get_one(request, queryset, fields):
+    names = fields.select(request)
+    row = queryset.values(*fields.lookups(names)).first()
+    if row is None:
+        raise NotFound
+    return fields.serialize(row, names)
+
+
+def visible_posts(request):
+    """Видимые публикации и, для автора, все его собственные."""
+    return Post.objects.filter(visible_posts_q(request.user))
+
+
+@api_view
+@login_required
+def post_list(request):
+    posts = filter_posts(Post.objects.all())
+    category = request.GET.get("category")
+    if category:
+        posts = posts.filter(category__slug=category)
+    return paginate(
+        request, posts, POST_FIELDS, FEED_ORDERING, MAX_POSTS_PER_PAGE
+    )
+
+
+@api_view
+@login_required
+def post_detail(request, post_id):
+    return get_one(
+        request, visible_posts(request).filter(pk=post_id), POST_FIELDS
+    )
+
+
+@api_view
+@login_required
+def post_comments(request, post_id):
+    if not visible_posts(request).filter(pk=post_id).exists():
+        raise NotFound
+    return paginate(
+        request,
+        Comment.objects.filter(post_id=post_id),
+        COMMENT_FIELDS,
+        COMMENT_ORDERING,
+        COMMENTS_PER_PAGE,
+    )
+
+
+@api_view
+@login_required
+def category_list(request):
+    return paginate(
+        request,
+        Category.objects.filter(is_published=True),
+        CATEGORY_FIELDS,
+        ("slug",),
+        API_MAX_LIMIT,
+    )
+
+
+@api_view
+def profile_detail(request, username):
+    return get_one(
+        request, User.objects.filter(username=username), PROFILE_FIELDS
+    )
+
+
+@api_view
+def profile_posts(request, username):
+    if not User.objects.filter(username=username).exists():
+        raise NotFound
+    posts = Post.objects.filter(author__username=username)
+    if request.user.username != username:
+        posts = filter_posts(posts)
+    return paginate(
+        request, posts, POST_FIELDS, FEED_ORDERING, MAX_POSTS_PER_PAGE
+    )
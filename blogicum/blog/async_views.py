@@ -0,0 +1,110 @@
+"""Асинхронные версии страниц для чтения — для запуска под ASGI.
+
+Контекст строят те же функции, что и в ``blog.views``, и там же, в пуле
+потоков БД (``core.db.run_db``), рендерится шаблон: он лениво догружает
+из базы пользователя и страницу публикаций и читает кэш карточек, а
+блокирующий ввод-вывод в event loop остановил бы все запросы процесса.
+"""
+from functools import wraps
+
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import render
+
+from blog.conditional import (
+    check_preconditions,
+    finish_response,
+    set_validators,
+)
+from blog.views import (
+    get_category_page,
+    get_category_validators,
+    get_index_context,
+    get_post_detail_context,
+    get_post_validators,
+    get_profile_page,
+    get_profile_validators,
+)
+from core.db import run_db
+from core.routers import replica_reads
+
+
+def resolve_user(request):
+    """Загружает пользователя из сессии, пока мы в потоке пула."""
+    return request.user.is_authenticated
+
+
+def login_required(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not await run_db(resolve_user, request):
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def conditional_view(get_validators):
+    """Асинхронная обёртка над ``blog.conditional.check_preconditions``."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            def prepare():
+                resolve_user(request)
+                return check_preconditions(
+                    request, get_validators, *args, **kwargs
+                )
+
+            validators, response = await run_db(prepare)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            return finish_response(response, validators)
+
+        return wrapper
+
+    return decorator
+
+
+async def render_page(request, template, build, *args):
+    """Строит контекст и рендерит ``template`` в пуле потоков БД."""
+    def prepare():
+        result = build(request, *args)
+        context, validators = (
+            result if isinstance(result, tuple) else (result, None)
+        )
+        return set_validators(
+            render(request, template, context), validators
+        )
+
+    return await run_db(prepare)
+
+
+@replica_reads
+@login_required
+async def index(request):
+    return await render_page(request, "blog/index.html", get_index_context)
+
+
+@replica_reads
+@login_required
+@conditional_view(get_post_validators)
+async def post_detail(request, post_id):
+    return await render_page(
+        request, "blog/detail.html", get_post_detail_context, post_id
+    )
+
+
+@replica_reads
+@login_required
+@conditional_view(get_category_validators)
+async def category_posts(request, category_slug):
+    return await render_page(
+        request, "blog/category.html", get_category_page, category_slug
+    )
+
+
+@replica_reads
+@conditional_view(get_profile_validators)
+async def user_profile(request, username):
+    return await render_page(
+        request, "blog/profile.html", get_profile_page, username
+    )
@@ -0,0 +1,152 @@
+import re
+from statistics import mean, median
+from time import perf_counter
+
+from django.db.models import Max
+from django.test import Client
+from django.urls import reverse
+
+from blog.models import Comment, Post
+
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(timings, queries):
+    total = sum(timings)
+    return {
+        "runs": len(timings),
+        "min_ms": min(timings) * 1000,
+        "median_ms": median(timings) * 1000,
+        "mean_ms": mean(timings) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "max_ms": max(timings) * 1000,
+        "rps": len(timings) / total if total else None,
+        "queries": max(queries) if queries else None,
+    }
+
+
+def run_scenario(client, method, make_request, repeat, warmup=2):
+    """Прогоняет сценарий ``warmup + repeat`` раз и возвращает сводку.
+
+    ``make_request`` вызывается перед каждым прогоном вне замера и
+    возвращает ``(url, data)`` — так сценарий удаления может заранее
+    создать удаляемый объект.
+    """
+    timings = []
+    queries = []
+    for run in range(warmup + repeat):
+        url, data = make_request()
+        started = perf_counter()
+        response = getattr(client, method)(url, data)
+        elapsed = perf_counter() - started
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f"{method.upper()} {url} вернул {response.status_code}"
+            )
+        if run < warmup:
+            continue
+        timings.append(elapsed)
+        match = QUERIES_RE.search(response.get("Server-Timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+    return summarize(timings, queries)
+
+
+def build_scenarios(user):
+    """Сценарии для представлений блога от имени ``user``.
+
+    Данные выбираются так, чтобы страницы были непустыми: самая
+    обсуждаемая публикация, её категория и профиль её автора.
+    """
+    post = (
+        Post.objects.filter(
+            is_published=True, category__is_published=True
+        )
+        .select_related("author", "category")
+        .order_by("-comment_count", "-pk")
+        .first()
+    )
+    if post is None:
+        raise BenchmarkError("Нет опубликованных публикаций для замеров.")
+    page = Post.objects.aggregate(last=Max("pk"))["last"] // 10 or 1
+
+    def comment_for_user():
+        return Comment.objects.create(post=post, author=user, text="Замер")
+
+    def edit_comment():
+        comment = comment_for_user()
+        return (
+            reverse("blog:edit_comment", args=(post.pk, comment.pk)),
+            {"text": "Изменённый замер"},
+        )
+
+    def delete_comment():
+        comment = comment_for_user()
+        return reverse("blog:delete_comment", args=(post.pk, comment.pk)), {}
+
+    return {
+        "index": ("get", lambda: (reverse("blog:index"), {})),
+        "index_deep_page": (
+            "get", lambda: (reverse("blog:index"), {"page": page})
+        ),
+        "post_detail": (
+            "get", lambda: (reverse("blog:post_detail", args=(post.pk,)), {})
+        ),
+        "category_posts": (
+            "get",
+            lambda: (
+                reverse("blog:category_posts", args=(post.category.slug,)),
+                {},
+            ),
+        ),
+        "user_profile": (
+            "get",
+            lambda: (
+                reverse("blog:profile", args=(post.author.username,)), {}
+            ),
+        ),
+        "add_comment": (
+            "post",
+            lambda: (
+                reverse("blog:add_comment", args=(post.pk,)),
+                {"text": "Новый замер"},
+            ),
+        ),
+        "edit_comment": ("post", edit_comment),
+        "delete_comment": ("post", delete_comment),
+    }
+
+
+def run_benchmark(user, repeat, names=None):
+    client = Client()
+    client.force_login(user)
+    results = {}
+    for name, (method, make_request) in build_scenarios(user).items():
+        if names and name not in names:
+            continue
+        results[name] = run_scenario(client, method, make_request, repeat)
+    return results
+
+
+def compare_reports(results, baseline):
+    """Изменение медианы относительно базового отчёта, в процентах."""
+    changes = {}
+    for name, stats in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+        changes[name] = (
+            (stats["median_ms"] - previous["median_ms"])
+            / previous["median_ms"] * 100
+        )
+    return changes
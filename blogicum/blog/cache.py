@@ -0,0 +1,136 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from blog.constants import FEED_PAGE_CACHE_TIMEOUT, FEED_PAGE_VERSION
+from blog.models import Category
+from core.routers import served_from_replica
+
+VERSION_KEY = "blog:version:{}"
+
+User = get_user_model()
+
+
+def get_cache():
+    return caches[getattr(settings, "BLOG_CACHE_ALIAS", DEFAULT_CACHE_ALIAS)]
+
+
+def get_versions(*names):
+    """Возвращает текущие версии групп кэша по их именам.
+
+    Версия — случайная строка; смена версии делает недоступными
+    все ключи, в которые она входит, без перебора самих ключей.
+    """
+    cache = get_cache()
+    keys = {VERSION_KEY.format(name): name for name in names}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid4().hex, None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_versions(*names):
+    get_cache().set_many(
+        {VERSION_KEY.format(name): uuid4().hex for name in names}, None
+    )
+
+
+def get_post_card_key(post):
+    """Ключ HTML-карточки публикации.
+
+    Карточка показывает поля публикации, категории, местоположения и имя
+    автора, поэтому ключ включает версии всех четырёх объектов.
+    """
+    names = (
+        f"post:{post.pk}",
+        f"category:{post.category_id}",
+        f"location:{post.location_id}",
+        f"user:{post.author_id}",
+    )
+    versions = get_versions(*names)
+    digest = md5(
+        ":".join(versions[name] for name in names).encode()
+    ).hexdigest()
+    return f"blog:post_card:{post.pk}:{digest}"
+
+
+def get_feed_page_timeout():
+    return getattr(
+        settings, "BLOG_FEED_PAGE_CACHE_TIMEOUT", FEED_PAGE_CACHE_TIMEOUT
+    )
+
+
+def get_feed_page_key(kind, ident, request, is_owner=False):
+    """Ключ страницы ленты или ``None``, если кэш страниц выключен.
+
+    Ключ зависит от ленты, номера страницы (или курсора), признака
+    владельца профиля и версий — своей у ленты и общей для всех лент.
+    """
+    if not get_feed_page_timeout():
+        return None
+    feed_version = f"feed:{kind}:{ident}"
+    versions = get_versions(feed_version, FEED_PAGE_VERSION)
+    page = request.GET.get("cursor") or request.GET.get("page") or ""
+    raw = ":".join((
+        kind,
+        ident,
+        versions[feed_version],
+        versions[FEED_PAGE_VERSION],
+        page,
+        str(int(is_owner)),
+    ))
+    return f"blog:feed_page:{md5(raw.encode()).hexdigest()}"
+
+
+def get_cached_feed_page(key):
+    if key is None:
+        return None
+    return get_cache().get(key)
+
+
+def cache_feed_page(key, context, request):
+    """Рендерит список публикаций и сохраняет его вместе с контекстом.
+
+    В кэш попадает всё, кроме ``page_obj``: при попадании шаблон
+    вставляет готовый ``feed_html`` и не обращается к базе данных.
+    ``rendered_at`` служит валидатором закэшированной страницы.
+    Страница, прочитанная с реплики, рендерится, но не кэшируется.
+    """
+    if key is None:
+        return
+    context["rendered_at"] = timezone.now()
+    context["feed_html"] = render_to_string(
+        "includes/post_list.html", context, request
+    )
+    if served_from_replica():
+        return
+    get_cache().set(
+        key,
+        {name: value for name, value in context.items()
+         if name != "page_obj"},
+        get_feed_page_timeout(),
+    )
+
+
+def invalidate_feed_pages(post_feeds):
+    """Сбрасывает кэш лент по парам ``(category_id, author_id)``."""
+    category_ids = {category_id for category_id, _ in post_feeds}
+    author_ids = {author_id for _, author_id in post_feeds}
+    slugs = Category.objects.filter(pk__in=category_ids).values_list(
+        "slug", flat=True
+    )
+    usernames = User.objects.filter(pk__in=author_ids).values_list(
+        "username", flat=True
+    )
+    bump_versions(
+        *(f"feed:category:{slug}" for slug in slugs),
+        *(f"feed:profile:{username}" for username in usernames),
+    )
@@ -0,0 +1,172 @@
+"""Пропускная способность страниц для чтения при параллельных запросах.
+
+Запросы идут прямо в WSGI- или ASGI-обработчик Django внутри процесса,
+без сети и HTTP-сервера: WSGI — из пула потоков (как у gunicorn с
+потоками), ASGI — задачами одного event loop (как у uvicorn). Так видна
+разница именно в обработке запроса Django и представлениями.
+"""
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from time import perf_counter
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import Client
+
+from blog.benchmark import BenchmarkError, build_scenarios, summarize
+
+READ_SCENARIOS = ("index", "post_detail", "category_posts", "user_profile")
+HOST = "localhost"
+
+
+def get_session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+    return f"{cookie.key}={cookie.value}"
+
+
+def get_read_urls(user):
+    scenarios = build_scenarios(user)
+    return {name: scenarios[name][1]()[0] for name in READ_SCENARIOS}
+
+
+def wsgi_environ(path, cookie):
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "HTTP_COOKIE": cookie,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+def wsgi_request(handler, path, cookie):
+    """GET ``path`` через WSGI-приложение: ``(статус, секунды)``."""
+    statuses = []
+    started = perf_counter()
+    body = handler(
+        wsgi_environ(path, cookie),
+        lambda status, headers, exc_info=None: statuses.append(status),
+    )
+    try:
+        for _chunk in body:
+            pass
+    finally:
+        body.close()
+    return int(statuses[0].split()[0]), perf_counter() - started
+
+
+def run_wsgi(path, cookie, concurrency, total):
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = perf_counter()
+        results = list(pool.map(
+            lambda _: wsgi_request(handler, path, cookie), range(total)
+        ))
+    return results, perf_counter() - started
+
+
+async def asgi_request(handler, path, cookie):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", HOST.encode()),
+            (b"cookie", cookie.encode()),
+        ],
+        "server": (HOST, 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    started = perf_counter()
+    await handler(scope, receive, send)
+    return statuses[0], perf_counter() - started
+
+
+def run_asgi(path, cookie, concurrency, total):
+    handler = ASGIHandler()
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with semaphore:
+                return await asgi_request(handler, path, cookie)
+
+        started = perf_counter()
+        results = await asyncio.gather(*(limited() for _ in range(total)))
+        return results, perf_counter() - started
+
+    return asyncio.run(run())
+
+
+INTERFACES = {"wsgi": run_wsgi, "asgi": run_asgi}
+
+
+def run_concurrency_benchmark(user, interface, levels, requests, names=None):
+    """Сводка по сценариям и уровням параллельности.
+
+    Ключи результата — ``"<сценарий>@<параллельность>"``, у каждой
+    записи есть ``rps`` по общему времени и задержки отдельных запросов.
+    """
+    cookie = get_session_cookie(user)
+    runner = INTERFACES[interface]
+    results = {}
+    for name, path in get_read_urls(user).items():
+        if names and name not in names:
+            continue
+        # Прогрев: шаблоны, кэш и соединения.
+        runner(path, cookie, 1, 2)
+        for concurrency in levels:
+            responses, elapsed = runner(path, cookie, concurrency, requests)
+            failed = [status for status, _ in responses if status >= 400]
+            if failed:
+                raise BenchmarkError(f"GET {path} вернул {failed[0]}")
+            stats = summarize([timing for _, timing in responses], [])
+            stats["rps"] = len(responses) / elapsed
+            stats["concurrency"] = concurrency
+            results[f"{name}@{concurrency}"] = stats
+    return results
+
+
+def compare_throughput(results, baseline):
+    """Изменение rps относительно базового отчёта, в процентах."""
+    changes = {}
+    for name, stats in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("rps"):
+            continue
+        changes[name] = (
+            (stats["rps"] - previous["rps"]) / previous["rps"] * 100
+        )
+    return changes
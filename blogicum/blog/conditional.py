@@ -0,0 +1,102 @@
+"""Условные GET-запросы: ETag и Last-Modified для страниц блога.
+
+Валидаторы считаются одним лёгким запросом к базе до вызова
+представления, и при совпадении клиент получает 304 без выборки
+публикаций и рендера шаблона. ETag включает пользователя — страницы
+автора, гостя и других пользователей различаются — и общую версию
+``FEED_PAGE_VERSION``, которая меняется при правке категорий,
+местоположений и пользователей. Для вошедшего пользователя в ETag входит
+и CSRF-токен его форм: после повторного входа токен другой, и 304 со
+старой страницей сломал бы отправку форм.
+"""
+from functools import wraps
+from hashlib import md5
+
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from blog.cache import get_versions
+from blog.constants import FEED_PAGE_VERSION
+
+
+def get_csrf_secret(request):
+    if not request.user.is_authenticated:
+        return ""
+    # get_token каждый раз маскирует токен по-новому; стабилен только
+    # сохранённый в META, который get_token создаёт при первом вызове.
+    get_token(request)
+    return request.META["CSRF_COOKIE"]
+
+
+def make_etag(request, *parts):
+    version = get_versions(FEED_PAGE_VERSION)[FEED_PAGE_VERSION]
+    raw = ":".join(
+        str(part) for part in (
+            request.user.pk or 0, get_csrf_secret(request), version, *parts
+        )
+    )
+    return md5(raw.encode()).hexdigest()
+
+
+def set_validators(response, validators):
+    """Выставляет валидаторы, известные только после рендера."""
+    if validators is not None:
+        etag, last_modified = validators
+        response["ETag"] = quote_etag(etag)
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def check_preconditions(request, get_validators, *args, **kwargs):
+    """Валидаторы страницы и готовый ответ, если копии клиента хватит.
+
+    Возвращает ``(validators, response)``; ``response`` — 304 (или 412),
+    если заголовки запроса совпали с валидаторами, иначе ``None``.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None, None
+    validators = get_validators(request, *args, **kwargs)
+    if validators is None:
+        return None, None
+    etag, last_modified = validators
+    response = get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified.timestamp()),
+    )
+    if response is not None:
+        response = finish_response(response, validators)
+    return validators, response
+
+
+def finish_response(response, validators):
+    """Валидаторы и ``no-cache`` для ответа с ETag."""
+    if validators is not None and not response.has_header("ETag"):
+        set_validators(response, validators)
+    if response.has_header("ETag"):
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_view(get_validators):
+    """Условный GET с одним вызовом ``get_validators`` на запрос.
+
+    ``get_validators`` возвращает ``(etag, last_modified)`` или ``None``,
+    если страницу нужно просто отдать представлению — например, ради 404.
+    Ответ помечается ``no-cache``: браузер хранит страницу, но каждый раз
+    сверяет её с сервером, а не угадывает срок свежести по Last-Modified.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            validators, response = check_preconditions(
+                request, get_validators, *args, **kwargs
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return finish_response(response, validators)
+
+        return wrapper
+
+    return decorator
@@ -1,2 +1,33 @@
 MAX_LENGTH_CHARFIELD = 256
 MAX_POSTS_PER_PAGE = 10
+FEED_PAGINATION_PAGE = "page"
+FEED_PAGINATION_CURSOR = "cursor"
+FEED_ORDERING = ("-pub_date", "-pk")
+FEED_COUNT_STRATEGY = "exact"
+FEED_COUNT_TIMEOUT = 60
+FEED_COUNT_VERSION = "feed_count"
+POST_CARD_CACHE_TIMEOUT = 60 * 10
+FEED_PAGE_CACHE_TIMEOUT = 0
+FEED_PAGE_VERSION = "feed:all"
+COMMENTS_PER_PAGE = 50
+COMMENT_ORDERING = ("created_at", "pk")
+SEARCH_MAX_TERMS = 10
+SEARCH_RANK_WINDOW = 1000
+IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280)
+IMAGE_FEED_WIDTH = 640
+IMAGE_DETAIL_WIDTH = 1280
+IMAGE_QUALITY = 80
+IMAGE_VARIANT_FORMAT = "webp"
+IMAGE_MAX_SIZE = 2560
+IMAGE_PROCESSING = "thread"
+IMAGE_PROCESSING_WORKERS = 2
+MEDIA_HASHED_DIR = "images"
+MEDIA_HASH_CHUNK_SIZE = 64 * 1024
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MEDIA_MAX_AGE = 60 * 60 * 24
+MEDIA_ORPHAN_MIN_AGE = 60 * 60
+SYNDICATION_ITEMS = 20
+SYNDICATION_CACHE_TIMEOUT = 60 * 60 * 24
+SYNDICATION_MAX_AGE = 60
+SYNDICATION_EXCERPT_WORDS = 10
+API_MAX_LIMIT = 100
@@ -0,0 +1,155 @@
+"""Конкуренция читателей и писателей за файл SQLite.
+
+Несколько процессов — как воркеры gunicorn — одновременно работают с
+копией базы: читатели выбирают первую страницу ленты и комментарии
+публикации, писатели добавляют и удаляют комментарии (сигналы при этом
+обновляют счётчик публикации). Один и тот же прогон повторяется для
+каждого профиля — набора PRAGMA и ``CONN_MAX_AGE``.
+"""
+import multiprocessing
+import os
+import sqlite3
+from time import perf_counter, sleep, time
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    close_old_connections,
+    connection,
+    connections,
+)
+
+from blog.benchmark import BenchmarkError, summarize
+from blog.constants import FEED_ORDERING, MAX_POSTS_PER_PAGE
+from blog.models import Comment, Post
+from blog.views import filter_posts
+
+# Как у Django без настройки: журнал отката и новое соединение на запрос.
+BASELINE_PRAGMAS = {"journal_mode": "delete", "synchronous": "full"}
+# Время на то, чтобы все процессы успели дойти до старта.
+START_DELAY = 0.5
+
+
+def copy_database(path, journal_mode):
+    """Копирует основную базу в ``path`` через backup API SQLite.
+
+    Режим журнала хранится в самом файле, поэтому он меняется сразу,
+    пока к копии никто не подключён.
+    """
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        connection.connection.backup(target)
+        target.execute(f"PRAGMA journal_mode = {journal_mode}")
+    finally:
+        target.close()
+
+
+def read(post_id, author_id):
+    list(
+        filter_posts(Post.objects.all())
+        .order_by(*FEED_ORDERING)[:MAX_POSTS_PER_PAGE]
+    )
+    list(Comment.objects.filter(post_id=post_id).select_related("author"))
+
+
+def write(post_id, author_id):
+    Comment.objects.create(
+        post_id=post_id, author_id=author_id, text="Замер"
+    ).delete()
+
+
+OPERATIONS = {"read": read, "write": write}
+
+
+def run_worker(task):
+    """Тело процесса-воркера: операции ``role`` до ``deadline``."""
+    role, path, pragmas, conn_max_age, start_at, deadline, ids = task
+    # Своё соединение с копией: унаследованное от родителя не трогаем.
+    inherited = connections[DEFAULT_DB_ALIAS]
+    connections[DEFAULT_DB_ALIAS] = type(inherited)(
+        {**inherited.settings_dict, "NAME": path,
+         "CONN_MAX_AGE": conn_max_age},
+        DEFAULT_DB_ALIAS,
+    )
+    settings.SQLITE_PRAGMAS = pragmas
+    operation = OPERATIONS[role]
+    timings = []
+    locked = 0
+    sleep(max(0, start_at - time()))
+    while time() < deadline:
+        started = perf_counter()
+        try:
+            operation(*ids)
+        except OperationalError:
+            locked += 1
+        else:
+            timings.append(perf_counter() - started)
+        # Как по окончании запроса: закрыть соединение, если
+        # CONN_MAX_AGE не разрешает его держать.
+        close_old_connections()
+    connection.close()
+    return role, timings, locked
+
+
+def summarize_role(outcomes, role, duration):
+    timings = [
+        timing
+        for outcome_role, role_timings, _ in outcomes
+        if outcome_role == role
+        for timing in role_timings
+    ]
+    stats = {
+        "ops": len(timings),
+        "ops_per_s": len(timings) / duration,
+        "locked": sum(
+            locked for outcome_role, _, locked in outcomes
+            if outcome_role == role
+        ),
+    }
+    if timings:
+        summary = summarize(timings, [])
+        for key in ("median_ms", "p95_ms", "max_ms"):
+            stats[key] = summary[key]
+    return stats
+
+
+def run_contention_benchmark(directory, profiles, readers, writers,
+                             duration):
+    """Сводка по профилям ``{имя: (pragmas, conn_max_age)}``.
+
+    Процессы создаются через ``fork``, как воркеры gunicorn, поэтому
+    замер работает только на POSIX-системах.
+    """
+    post = (
+        Post.objects.filter(is_published=True)
+        .order_by("-comment_count", "-pk")
+        .first()
+    )
+    if post is None:
+        raise BenchmarkError("Нет опубликованных публикаций для замеров.")
+    ids = (post.pk, post.author_id)
+    context = multiprocessing.get_context("fork")
+    results = {}
+    for name, (pragmas, conn_max_age) in profiles.items():
+        path = os.path.join(directory, f"{name}.sqlite3")
+        copy_database(path, pragmas.get("journal_mode", "delete"))
+        connections.close_all()
+        roles = ["read"] * readers + ["write"] * writers
+        with context.Pool(len(roles)) as pool:
+            start_at = time() + START_DELAY
+            outcomes = pool.map(
+                run_worker,
+                [
+                    (role, path, pragmas, conn_max_age, start_at,
+                     start_at + duration, ids)
+                    for role in roles
+                ],
+                chunksize=1,
+            )
+        results[name] = {
+            role: summarize_role(outcomes, role, duration)
+            for role in OPERATIONS
+        }
+    return results
@@ -0,0 +1,90 @@
+"""Генерация синтетических строк для seed_blog.
+
+Модуль не импортирует Django, чтобы его функции можно было выполнять
+в дочерних процессах при любом способе их запуска. Случайные значения
+пачки зависят только от ``(seed, kind, chunk)``, поэтому результат не
+зависит от числа процессов. Единственное, что берётся из базы, —
+``start``: сквозной номер строки в уникальных полях (имя пользователя,
+slug категории) продолжает последний id таблицы, чтобы повторный
+запуск не упирался в уже занятые значения. На пустой базе номера
+начинаются с нуля, и одинаковые параметры дают одинаковые строки.
+"""
+import random
+
+from faker import Faker
+
+LOCALE = "ru_RU"
+MAX_USERNAME_LENGTH = 150
+MAX_TITLE_LENGTH = 256
+MAX_COMMENT_LENGTH = 140
+
+
+def user_row(fake, rng, number, refs):
+    username = f"{fake.user_name()}-{number}"
+    return {
+        "username": username[-MAX_USERNAME_LENGTH:],
+        "first_name": fake.first_name(),
+        "last_name": fake.last_name(),
+        "email": fake.email(),
+    }
+
+
+def category_row(fake, rng, number, refs):
+    return {
+        "title": fake.word().capitalize(),
+        "description": fake.paragraph(nb_sentences=2),
+        "slug": f"category-{number}",
+        # Каждая десятая категория скрыта; первая всегда опубликована.
+        "is_published": number % 10 != 9,
+    }
+
+
+def location_row(fake, rng, number, refs):
+    return {"name": fake.city()}
+
+
+def post_row(fake, rng, number, refs):
+    return {
+        "title": fake.sentence(nb_words=4)[:MAX_TITLE_LENGTH],
+        "text": fake.paragraph(nb_sentences=6),
+        "minutes_ago": rng.randrange(1, 10 ** 6),
+        "author": rng.randrange(refs["users"]),
+        "category": rng.randrange(refs["categories"]),
+        # Индекс, равный числу местоположений, означает «без места».
+        "location": rng.randrange(refs["locations"] + 1),
+        "is_published": rng.random() > 0.05,
+    }
+
+
+def comment_row(fake, rng, number, refs):
+    return {
+        "text": fake.sentence(nb_words=10)[:MAX_COMMENT_LENGTH],
+        "post": rng.randrange(refs["posts"]),
+        "author": rng.randrange(refs["users"]),
+    }
+
+
+ROW_FACTORIES = {
+    "users": user_row,
+    "categories": category_row,
+    "locations": location_row,
+    "posts": post_row,
+    "comments": comment_row,
+}
+
+
+def generate_chunk(task):
+    """Строки одной пачки: ``task = (kind, seed, chunk, start, count, refs)``.
+
+    Ссылки на другие модели возвращаются как порядковые номера среди
+    созданных тем же запуском объектов; в id их переводит вызывающий.
+    """
+    kind, seed, chunk, start, count, refs = task
+    chunk_seed = f"{seed}:{kind}:{chunk}"
+    fake = Faker(LOCALE)
+    fake.seed_instance(chunk_seed)
+    rng = random.Random(chunk_seed)
+    make_row = ROW_FACTORIES[kind]
+    return [
+        make_row(fake, rng, start + index, refs) for index in range(count)
+    ]
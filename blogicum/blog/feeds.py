@@ -0,0 +1,190 @@
+"""RSS- и Atom-ленты категорий и авторов.
+
+Готовый XML хранится в кэше под ключом с версией ленты
+(``syndication:category:<id>`` или ``syndication:author:<id>``), которую
+сигналы меняют при сохранении и удалении публикаций. Если в ленте ждёт
+отложенная публикация, запись живёт только до её ``pub_date``. Опрос
+неизменившейся ленты — это один запрос за категорией или автором и
+ответ 304.
+
+Ленты открыты без входа и кэшируются публично, поэтому в них только
+заголовок, ссылка и начало текста — столько же, сколько в карточке на
+открытой странице профиля. Полный текст — на странице публикации.
+"""
+from hashlib import md5
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.db.models import Min
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.utils.text import Truncator
+
+from blog.cache import get_cache, get_versions
+from blog.constants import (
+    FEED_ORDERING,
+    FEED_PAGE_VERSION,
+    SYNDICATION_CACHE_TIMEOUT,
+    SYNDICATION_EXCERPT_WORDS,
+    SYNDICATION_ITEMS,
+    SYNDICATION_MAX_AGE,
+)
+from blog.models import Category, Post
+from blog.views import filter_posts
+from core.routers import replica_reads, served_from_replica
+
+User = get_user_model()
+
+
+class PostFeed(Feed):
+    """Последние видимые публикации; наследники сужают их источник."""
+
+    version_prefix = None
+
+    def get_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return filter_posts(self.get_posts(obj)).order_by(*FEED_ORDERING)[
+            :SYNDICATION_ITEMS
+        ]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(SYNDICATION_EXCERPT_WORDS)
+
+    def item_link(self, item):
+        return reverse("blog:post_detail", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,) if item.category else ()
+
+    def get_timeout(self, obj):
+        """До ближайшей отложенной публикации, но не дольше лимита."""
+        next_pub_date = (
+            self.get_posts(obj)
+            .filter(is_published=True, pub_date__gt=timezone.now())
+            .aggregate(next=Min("pub_date"))["next"]
+        )
+        if next_pub_date is None:
+            return SYNDICATION_CACHE_TIMEOUT
+        seconds = (next_pub_date - timezone.now()).total_seconds()
+        return max(1, min(SYNDICATION_CACHE_TIMEOUT, int(seconds) + 1))
+
+    def get_cache_key(self, obj, request):
+        # Ссылки в XML абсолютные: лента для другого хоста или схемы —
+        # другой документ.
+        version_name = f"syndication:{self.version_prefix}:{obj.pk}"
+        versions = get_versions(version_name, FEED_PAGE_VERSION)
+        raw = ":".join((
+            request.scheme,
+            request.get_host(),
+            self.feed_type.__name__,
+            version_name,
+            versions[version_name],
+            versions[FEED_PAGE_VERSION],
+        ))
+        return f"blog:syndication:{md5(raw.encode()).hexdigest()}"
+
+    def render(self, obj, request):
+        feed = self.get_feed(obj, request)
+        return {
+            "content": feed.writeString("utf-8"),
+            "content_type": feed.content_type,
+            "rendered_at": timezone.now(),
+        }
+
+    @method_decorator(replica_reads)
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        key = self.get_cache_key(obj, request)
+        cache = get_cache()
+        cached = cache.get(key)
+        if cached is None:
+            cached = self.render(obj, request)
+            if not served_from_replica():
+                cache.set(key, cached, self.get_timeout(obj))
+        etag = quote_etag(
+            md5(f"{key}:{cached['rendered_at'].isoformat()}".encode())
+            .hexdigest()
+        )
+        last_modified = int(cached["rendered_at"].timestamp())
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified,
+            response=HttpResponse(
+                cached["content"], content_type=cached["content_type"]
+            ),
+        )
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=SYNDICATION_MAX_AGE)
+        return response
+
+
+class CategoryFeed(PostFeed):
+    version_prefix = "category"
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def get_posts(self, obj):
+        return Post.objects.filter(category=obj)
+
+    def title(self, obj):
+        return f"Публикации в категории {obj.title}"
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse("blog:category_posts", args=[obj.slug])
+
+
+class AuthorFeed(PostFeed):
+    version_prefix = "author"
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, obj):
+        return Post.objects.filter(author=obj)
+
+    def title(self, obj):
+        return f"Публикации пользователя {obj.username}"
+
+    def description(self, obj):
+        return self.title(obj)
+
+    def link(self, obj):
+        return reverse("blog:profile", args=[obj.username])
+
+
+class CategoryAtomFeed(CategoryFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryFeed.description
+
+
+class AuthorAtomFeed(AuthorFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorFeed.description
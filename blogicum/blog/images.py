@@ -0,0 +1,165 @@
+"""Обработка картинок публикаций.
+
+Оригинал поворачивается по EXIF-ориентации, теряет метаданные (в EXIF
+бывают координаты съёмки) и уменьшается до ``IMAGE_MAX_SIZE``; очищенный
+оригинал сохраняется как новый файл. Для каждой ширины из
+``IMAGE_VARIANT_WIDTHS``, меньшей ширины оригинала, рядом с ним
+сохраняется WebP ``<имя>.<ширина>w.webp``. Имена
+вычисляются из имени оригинала, поэтому шаблонам достаточно
+``Post.image_info`` — размеров оригинала и списка готовых ширин;
+файловое хранилище при рендере не трогается.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from blog.constants import (
+    IMAGE_MAX_SIZE,
+    IMAGE_QUALITY,
+    IMAGE_VARIANT_FORMAT,
+    IMAGE_VARIANT_WIDTHS,
+)
+from blog.storage import get_variant_storage, release_file
+
+# Ошибки Pillow на повреждённых и слишком больших картинках.
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+# Копии, созданные до перехода на WebP, не записывали свой формат.
+LEGACY_VARIANT_FORMAT = "jpg"
+ORIGINAL_SAVE_OPTIONS = {
+    "JPEG": {"quality": 90, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 90},
+}
+
+
+def variant_name(name, width, extension=IMAGE_VARIANT_FORMAT):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{width}w.{extension}"
+
+
+def get_variant_names(name, info):
+    """Имена готовых копий по ширине — по сведениям из ``image_info``."""
+    extension = info.get("format", LEGACY_VARIANT_FORMAT)
+    return {
+        width: variant_name(name, width, extension)
+        for width in info.get("variants", ())
+    }
+
+
+def delete_variants(name, info, storage=default_storage):
+    variant_storage = get_variant_storage(storage)
+    for variant in get_variant_names(name, info).values():
+        variant_storage.delete(variant)
+
+
+def release_image(name, info, storage=default_storage):
+    """Снимает ссылку на оригинал; копии удаляются вместе с ним."""
+    if release_file(storage, name):
+        delete_variants(name, info, storage)
+
+
+def replace_file(storage, name, data):
+    storage.delete(name)
+    storage.save(name, ContentFile(data))
+
+
+def encode(image, image_format, **options):
+    """Сохраняет картинку без метаданных, кроме цветового профиля."""
+    icc_profile = image.info.get("icc_profile")
+    image.info = {}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def get_save_format(image):
+    """Формат, в котором можно перезаписать оригинал, или ``None``.
+
+    Многие телефоны сохраняют снимки как MPO — JPEG с дополнительными
+    кадрами; оригинал из него — обычный JPEG по первому кадру. Прочие
+    анимации не перезаписываются: от них остался бы один кадр.
+    """
+    if image.format == "MPO":
+        return "JPEG"
+    if getattr(image, "is_animated", False) or image.format not in Image.SAVE:
+        return None
+    return image.format
+
+
+def needs_rewrite(image):
+    """Нужно ли перезаписать оригинал: есть метаданные или он велик."""
+    if get_save_format(image) is None:
+        return False
+    has_metadata = bool(image.getexif()) or "xmp" in image.info
+    return has_metadata or max(image.size) > IMAGE_MAX_SIZE
+
+
+def process_image(name, storage=default_storage):
+    """Чистит оригинал и создаёт копии; возвращает ``(имя, сведения)``.
+
+    Имя меняется, если оригинал пришлось перезаписать: прежний файл
+    остаётся, пока вызывающий не снимет с него ссылку.
+
+    Копии строятся от большей к меньшей, каждая — из предыдущей:
+    уменьшать уже уменьшенную картинку намного дешевле, чем оригинал.
+    """
+    with storage.open(name) as file, Image.open(file) as source:
+        image_format = get_save_format(source)
+        size = source.size
+        rewrite = needs_rewrite(source)
+        if not rewrite:
+            # JPEG можно сразу декодировать в уменьшенном масштабе.
+            largest = max(IMAGE_VARIANT_WIDTHS)
+            source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        if image.size != source.size:
+            # Поворот на 90°: размеры оригинала — в новой ориентации.
+            size = size[::-1]
+    if rewrite:
+        image.thumbnail(
+            (IMAGE_MAX_SIZE, IMAGE_MAX_SIZE), Image.LANCZOS, reducing_gap=3.0
+        )
+        name = storage.save(
+            name,
+            ContentFile(
+                encode(
+                    image.copy(),
+                    image_format,
+                    **ORIGINAL_SAVE_OPTIONS.get(image_format, {}),
+                )
+            ),
+        )
+        size = image.size
+
+    width, height = size
+    widths = sorted(
+        (variant for variant in IMAGE_VARIANT_WIDTHS if variant < width),
+        reverse=True,
+    )
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+        "transparency" in image.info
+    )
+    current = image.convert("RGBA" if has_alpha else "RGB")
+    variant_storage = get_variant_storage(storage)
+    for variant in widths:
+        current = current.resize(
+            (variant, max(1, round(height * variant / width))),
+            Image.LANCZOS,
+            reducing_gap=3.0,
+        )
+        replace_file(
+            variant_storage,
+            variant_name(name, variant),
+            encode(current, "WEBP", quality=IMAGE_QUALITY, method=4),
+        )
+    return name, {
+        "width": width,
+        "height": height,
+        "format": IMAGE_VARIANT_FORMAT,
+        "variants": widths[::-1],
+    }
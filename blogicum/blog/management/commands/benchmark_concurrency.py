@@ -0,0 +1,102 @@
+import json
+import os
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.benchmark import BenchmarkError
+from blog.concurrency import (
+    INTERFACES,
+    READ_SCENARIOS,
+    compare_throughput,
+    run_concurrency_benchmark,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет пропускную способность страниц для чтения при "
+        "параллельных запросах через WSGI или ASGI. Для честного "
+        "сравнения ASGI запускайте с --settings=blogicum.settings_asgi, "
+        "а отчёт WSGI передавайте в --baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interface", choices=sorted(INTERFACES), default="wsgi"
+        )
+        parser.add_argument(
+            "--concurrency",
+            default="1,8,32",
+            help="Уровни параллельности через запятую.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Сколько запросов делать на каждом уровне.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=READ_SCENARIOS,
+        )
+        parser.add_argument("--output")
+        parser.add_argument(
+            "--baseline",
+            help="JSON-отчёт другого интерфейса для сравнения rps.",
+        )
+
+    def handle(self, *args, interface, concurrency, requests, scenarios,
+               output, baseline, **options):
+        try:
+            levels = [int(level) for level in concurrency.split(",")]
+        except ValueError:
+            raise CommandError("--concurrency: нужны целые числа.")
+        if not levels or min(levels) < 1 or requests < 1:
+            raise CommandError("Параллельность и число запросов > 0.")
+        user, _ = User.objects.get_or_create(username="benchmark")
+        try:
+            results = run_concurrency_benchmark(
+                user, interface, levels, requests, scenarios
+            )
+        except BenchmarkError as error:
+            raise CommandError(error)
+
+        report = {
+            "meta": {
+                "interface": interface,
+                "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+                "async_views": getattr(settings, "BLOG_ASYNC_VIEWS", False),
+                "async_db_threads": getattr(
+                    settings, "ASYNC_DB_THREADS", None
+                ),
+                "requests": requests,
+            },
+            "results": results,
+        }
+        if baseline:
+            with open(baseline, encoding="utf-8") as file:
+                report["change_pct"] = compare_throughput(
+                    results, json.load(file)
+                )
+        for name, stats in results.items():
+            line = (
+                f"{name}: {stats['rps']:.1f} rps, "
+                f"median {stats['median_ms']:.2f} ms, "
+                f"p95 {stats['p95_ms']:.2f} ms"
+            )
+            if name in report.get("change_pct", {}):
+                line += f" ({report['change_pct'][name]:+.1f}%)"
+            self.stderr.write(line)
+
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if output:
+            with open(output, "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
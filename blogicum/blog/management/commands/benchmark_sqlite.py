@@ -0,0 +1,83 @@
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.benchmark import BenchmarkError
+from blog.contention import BASELINE_PRAGMAS, run_contention_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает конкуренцию читателей и писателей SQLite без "
+        "настройки и с SQLITE_PRAGMAS и CONN_MAX_AGE текущих настроек. "
+        "Запускайте с --settings=blogicum.settings_production; база "
+        "копируется во временный каталог и не меняется."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--readers", type=int, default=4,
+            help="Процессов, которые только читают.",
+        )
+        parser.add_argument(
+            "--writers", type=int, default=2,
+            help="Процессов, которые пишут комментарии.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0,
+            help="Длительность прогона каждого профиля, секунд.",
+        )
+        parser.add_argument("--output")
+
+    def handle(self, *args, readers, writers, duration, output, **options):
+        database = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if database["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("Замер имеет смысл только для SQLite.")
+        pragmas = getattr(settings, "SQLITE_PRAGMAS", None)
+        if not pragmas:
+            raise CommandError(
+                "SQLITE_PRAGMAS пуст: запустите с "
+                "--settings=blogicum.settings_production."
+            )
+        if readers < 0 or writers < 0 or readers + writers == 0:
+            raise CommandError("Нужен хотя бы один читатель или писатель.")
+        profiles = {
+            "baseline": (BASELINE_PRAGMAS, 0),
+            "tuned": (pragmas, database.get("CONN_MAX_AGE", 0)),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                results = run_contention_benchmark(
+                    directory, profiles, readers, writers, duration
+                )
+            except BenchmarkError as error:
+                raise CommandError(error)
+
+        for profile, roles in results.items():
+            for role, stats in roles.items():
+                self.stderr.write(
+                    f"{profile} {role}: {stats['ops_per_s']:.1f} ops/s, "
+                    f"p95 {stats.get('p95_ms', 0):.2f} ms, "
+                    f"locked {stats['locked']}"
+                )
+        report = {
+            "meta": {
+                "readers": readers,
+                "writers": writers,
+                "duration": duration,
+                "profiles": {
+                    name: {"pragmas": pragmas, "conn_max_age": max_age}
+                    for name, (pragmas, max_age) in profiles.items()
+                },
+            },
+            "results": results,
+        }
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if output:
+            with open(output, "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.contention import copy_database
+
+DEFAULT_PROFILES = ("blogicum.settings", "blogicum.settings_production")
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает профили настроек: время старта процесса, память и "
+        "задержку первых и последующих запросов страниц для чтения. "
+        "Каждый профиль запускается в отдельном процессе на своей копии "
+        "базы."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            action="append",
+            dest="profiles",
+            help="Модуль настроек (можно повторять); по умолчанию "
+                 "settings и settings_production.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Сколько раз открыть каждую страницу.",
+        )
+        parser.add_argument("--output")
+
+    def measure(self, profile, directory, requests):
+        name = profile.rsplit(".", 1)[-1]
+        database = os.path.join(directory, f"{name}.sqlite3")
+        copy_database(database, "delete")
+        environment = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": profile,
+            # Профилю production нужен ключ; для замера подойдёт любой.
+            "DJANGO_SECRET_KEY": os.environ.get(
+                "DJANGO_SECRET_KEY", "benchmark-startup"
+            ),
+            "DJANGO_CACHE_LOCATION": os.path.join(
+                directory, f"{name}-cache.sqlite3"
+            ),
+        }
+        process = subprocess.run(
+            [sys.executable, "-m", "blog.startup", database, str(requests)],
+            cwd=settings.BASE_DIR,
+            env=environment,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(
+                f"{profile}: {process.stderr.strip().splitlines()[-1]}"
+            )
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, profiles, requests, output, **options):
+        if requests < 1:
+            raise CommandError("--requests должно быть больше нуля.")
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in profiles or DEFAULT_PROFILES:
+                results[profile] = self.measure(profile, directory, requests)
+
+        for profile, stats in results.items():
+            self.stderr.write(
+                f"{profile}: старт {stats['startup_s']:.2f} s, "
+                f"RSS {stats['rss_startup_mb']:.1f} → "
+                f"{stats['rss_peak_mb']:.1f} MiB"
+            )
+            for page, timings in stats["pages"].items():
+                self.stderr.write(
+                    f"  {page}: первый {timings['first_ms']:.1f} ms, "
+                    f"медиана {timings['median_ms']:.2f} ms, "
+                    f"p95 {timings['p95_ms']:.2f} ms"
+                )
+        content = json.dumps(
+            {"meta": {"requests": requests}, "results": results},
+            ensure_ascii=False,
+            indent=2,
+        )
+        if output:
+            with open(output, "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
@@ -0,0 +1,127 @@
+import json
+import os
+import platform
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from blog.benchmark import BenchmarkError, compare_reports, run_benchmark
+from blog.models import Category, Comment, Location, Post
+from blog.seeding import seed_blog
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет задержку и пропускную способность представлений блога "
+        "и сохраняет JSON-отчёт для сравнения между релизами."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Перед замерами заполнить базу синтетическими данными.",
+        )
+        parser.add_argument("--users", type=int, default=100000)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--locations", type=int, default=500)
+        parser.add_argument("--posts", type=int, default=1000000)
+        parser.add_argument("--comments", type=int, default=10000000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--random-seed", type=int, default=0)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Сколько замеров делать для каждого сценария.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            help="Запустить только этот сценарий (можно повторять).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Куда записать JSON-отчёт; по умолчанию — в stdout.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON-отчёт прошлого релиза для сравнения медиан.",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed_blog(
+                users=options["users"],
+                categories=options["categories"],
+                locations=options["locations"],
+                posts=options["posts"],
+                comments=options["comments"],
+                batch_size=options["batch_size"],
+                seed=options["random_seed"],
+                workers=options["workers"],
+            )
+        user, _ = User.objects.get_or_create(username="benchmark")
+        # Тестовый клиент ходит на хост testserver.
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            try:
+                results = run_benchmark(
+                    user, options["repeat"], options["scenarios"]
+                )
+            except BenchmarkError as error:
+                raise CommandError(error)
+
+        report = {
+            "meta": self.get_meta(),
+            "results": results,
+        }
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as file:
+                report["change_pct"] = compare_reports(
+                    results, json.load(file)
+                )
+        for name, stats in results.items():
+            line = (
+                f"{name}: median {stats['median_ms']:.2f} ms, "
+                f"p95 {stats['p95_ms']:.2f} ms, {stats['queries']} queries"
+            )
+            if name in report.get("change_pct", {}):
+                line += f" ({report['change_pct'][name]:+.1f}%)"
+            self.stderr.write(line)
+
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
+
+    def get_meta(self):
+        return {
+            "created_at": timezone.now().isoformat(),
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+            "debug": settings.DEBUG,
+            "database": connection.vendor,
+            "feed_pagination": getattr(settings, "BLOG_FEED_PAGINATION", None),
+            "feed_count": getattr(settings, "BLOG_FEED_COUNT", None),
+            "rows": {
+                "users": User.objects.count(),
+                "categories": Category.objects.count(),
+                "locations": Location.objects.count(),
+                "posts": Post.objects.count(),
+                "comments": Comment.objects.count(),
+            },
+        }
@@ -0,0 +1,24 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.cache import get_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает попадания, промахи и вытеснения кэша блога "
+        "(BLOG_CACHE_ALIAS) по всем воркерам."
+    )
+
+    def handle(self, *args, **options):
+        cache = get_cache()
+        if not hasattr(cache, "stats"):
+            raise CommandError(
+                f"{type(cache).__name__} не ведёт счётчиков: нужен "
+                "core.cache.SQLiteCache."
+            )
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else None
+        self.stdout.write(json.dumps(stats, indent=2))
@@ -0,0 +1,203 @@
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.constants import MEDIA_ORPHAN_MIN_AGE
+from blog.images import get_variant_names
+from blog.models import Post, StoredFile
+
+
+def scan_media(root, skip=()):
+    """Файлы под ``root`` — пары ``(имя в хранилище, DirEntry)``.
+
+    ``os.scandir`` отдаёт тип и ``stat`` без лишних системных вызовов,
+    а обход по стеку не держит в памяти весь список файлов.
+    """
+    stack = [("", root)]
+    while stack:
+        prefix, directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in skip:
+                        stack.append((f"{name}/", entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    yield name, entry
+
+
+def find_orphans(root, references, deadline, skip=(), live=()):
+    """Файлы без ссылок старше ``deadline`` — пары ``(имя, размер)``.
+
+    ``live`` — имена с живой учётной записью ``StoredFile``: на них уже
+    ссылается публикация, которая ещё не сохранена.
+    """
+    for name, entry in scan_media(root, skip):
+        if name in references or name in live:
+            continue
+        stat = entry.stat(follow_symlinks=False)
+        if stat.st_mtime <= deadline:
+            yield name, stat.st_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет из MEDIA_ROOT файлы, на которые не ссылается ни одна "
+        "публикация, вместе с их уменьшенными копиями."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать, что будет удалено.",
+        )
+        parser.add_argument(
+            "--quarantine",
+            metavar="DIR",
+            help="Переносить файлы в этот каталог вместо удаления.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=MEDIA_ORPHAN_MIN_AGE,
+            help=(
+                "Не трогать файлы моложе стольких секунд: они могут "
+                "принадлежать публикации, которая ещё сохраняется."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько файлов удалять за раз.",
+        )
+
+    def handle(self, *args, dry_run, quarantine, min_age, batch_size,
+               verbosity, **options):
+        if batch_size < 1:
+            raise CommandError("--batch-size должен быть положительным.")
+        root = os.path.abspath(settings.MEDIA_ROOT)
+        skip = set()
+        if quarantine:
+            quarantine = os.path.abspath(quarantine)
+            skip.add(quarantine)
+        # Граница берётся до выборки ссылок: файл, появившийся позже,
+        # окажется моложе неё и останется на месте. Старый файл, который
+        # загрузили повторно, хранилище «трогает» (mtime) и заводит на
+        # него живую учётную запись — такие тоже не удаляются.
+        deadline = time.time() - min_age
+        references = self.count_references(batch_size)
+        live = set(
+            StoredFile.objects.filter(references__gt=0)
+            .values_list("name", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+
+        found = size = 0
+        batch = []
+        for name, file_size in find_orphans(
+            root, references, deadline, skip, live
+        ):
+            found += 1
+            size += file_size
+            if verbosity > 1:
+                self.stdout.write(name)
+            if not dry_run:
+                batch.append(name)
+                if len(batch) >= batch_size:
+                    self.remove(root, batch, quarantine, deadline)
+                    batch = []
+        if batch:
+            self.remove(root, batch, quarantine, deadline)
+
+        fixed = 0 if dry_run else self.fix_references(references, batch_size)
+        if verbosity:
+            action = (
+                "Будет удалено" if dry_run
+                else "Перенесено" if quarantine
+                else "Удалено"
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{action} файлов: {found} ({size} байт). "
+                    f"Исправлено счётчиков ссылок: {fixed}."
+                )
+            )
+
+    def count_references(self, batch_size):
+        """Сколько публикаций ссылается на каждый файл, включая копии."""
+        references = Counter()
+        posts = (
+            Post.objects.exclude(image="")
+            .values_list("image", "image_info")
+            .iterator(chunk_size=batch_size)
+        )
+        for name, info in posts:
+            references[name] += 1
+            references.update(get_variant_names(name, info).values())
+        return references
+
+    def is_referenced(self, name):
+        return (
+            StoredFile.objects.filter(name=name, references__gt=0).exists()
+            or Post.objects.filter(image=name).exists()
+        )
+
+    def remove(self, root, names, quarantine, deadline):
+        for name in names:
+            path = os.path.join(root, name)
+            # Между обходом и удалением файл могли загрузить заново:
+            # ссылки и mtime проверяются ещё раз перед самым удалением.
+            with transaction.atomic():
+                if self.is_referenced(name):
+                    continue
+                try:
+                    if os.stat(path).st_mtime > deadline:
+                        continue
+                    if quarantine:
+                        os.renames(path, os.path.join(quarantine, name))
+                    else:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+                StoredFile.objects.filter(
+                    name=name, references=0
+                ).delete()
+
+    def fix_references(self, references, batch_size):
+        """Сверяет ``StoredFile.references`` с числом публикаций.
+
+        Снимок ``references`` снят до обхода и мог устареть: по нему
+        только отбираются расхождения, а число публикаций для каждого
+        считается заново под блокировкой строки — иначе одновременные
+        acquire и release затёрлись бы, а заниженный счётчик удалил бы
+        файл, на который ещё ссылаются.
+        """
+        candidates = [
+            name
+            for name, stored in StoredFile.objects.values_list(
+                "name", "references"
+            ).iterator(chunk_size=batch_size)
+            if references.get(name) and stored != references[name]
+        ]
+        fixed = 0
+        for name in candidates:
+            with transaction.atomic():
+                stored = (
+                    StoredFile.objects.select_for_update()
+                    .filter(name=name)
+                    .first()
+                )
+                if stored is None:
+                    continue
+                actual = Post.objects.filter(image=name).count()
+                if actual and stored.references != actual:
+                    stored.references = actual
+                    stored.save(update_fields=["references"])
+                    fixed += 1
+        return fixed
@@ -0,0 +1,84 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog.constants import FEED_ORDERING, MAX_POSTS_PER_PAGE
+from blog.models import Comment, Post
+from blog.views import filter_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает планы и время запросов лент; с --compare — ещё и "
+        "без индексов из Meta.indexes, чтобы увидеть разницу."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Повторить замеры без индексов (в откатываемой транзакции).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Сколько раз выполнять каждый запрос для замера времени.",
+        )
+
+    def get_feed_querysets(self):
+        post = Post.objects.order_by("-pk").first()
+        if post is None:
+            raise CommandError(
+                "Нет публикаций: сначала заполните базу данными."
+            )
+        feeds = {
+            "index": filter_posts(Post.objects),
+            "category_posts": filter_posts(
+                Post.objects.filter(category_id=post.category_id)
+            ),
+            "user_profile (owner)": Post.objects.filter(
+                author_id=post.author_id
+            ),
+            "user_profile": filter_posts(
+                Post.objects.filter(author_id=post.author_id)
+            ),
+        }
+        querysets = {
+            name: queryset.order_by(*FEED_ORDERING)[:MAX_POSTS_PER_PAGE]
+            for name, queryset in feeds.items()
+        }
+        querysets["post_detail comments"] = Comment.objects.filter(
+            post_id=post.pk
+        )
+        return querysets
+
+    def report(self, title, querysets, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in querysets.items():
+            started = perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (perf_counter() - started) / repeat * 1000
+            self.stdout.write(
+                self.style.MIGRATE_LABEL(f"{name}: {elapsed:.2f} ms")
+            )
+            self.stdout.write(queryset.explain())
+
+    def handle(self, *args, compare, repeat, **options):
+        querysets = self.get_feed_querysets()
+        if compare:
+            with transaction.atomic():
+                editor = connection.schema_editor()
+                with connection.cursor() as cursor:
+                    for model in (Post, Comment):
+                        for index in model._meta.indexes:
+                            cursor.execute(
+                                str(index.remove_sql(model, editor))
+                            )
+                self.report("Без индексов", querysets, repeat)
+                transaction.set_rollback(True)
+            # sqlite3 кэширует подготовленные EXPLAIN вместе с планом.
+            connection.close()
+        self.report("С индексами", querysets, repeat)
@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+
+from blog.constants import IMAGE_PROCESSING_WORKERS
+from blog.models import Post
+from blog.tasks import run_in_thread, run_safely
+
+
+class Command(BaseCommand):
+    help = (
+        "Обрабатывает картинки публикаций со статусом «Обрабатывается». "
+        "Без --loop выходит, когда очередь пуста."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, опрашивая очередь.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Пауза между опросами пустой очереди, в секундах.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=IMAGE_PROCESSING_WORKERS
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Сколько публикаций забирать из очереди за раз.",
+        )
+        parser.add_argument(
+            "--requeue",
+            action="store_true",
+            help=(
+                "Поставить в очередь все картинки, например после смены "
+                "IMAGE_VARIANT_WIDTHS."
+            ),
+        )
+
+    def handle(self, *args, loop, interval, workers, batch_size, requeue,
+               verbosity, **options):
+        if requeue:
+            Post.objects.exclude(image="").update(
+                image_status=Post.ImageStatus.PROCESSING
+            )
+        queue = Post.objects.filter(
+            image_status=Post.ImageStatus.PROCESSING
+        ).order_by("pk")
+        processed = 0
+        last_id = 0
+        pool = ThreadPoolExecutor(workers) if workers > 1 else None
+        with pool or nullcontext():
+            while True:
+                # Проход идёт по возрастанию id: задача, которая так и не
+                # вышла из очереди, не будет повторяться бесконечно.
+                post_ids = list(
+                    queue.filter(pk__gt=last_id).values_list(
+                        "pk", flat=True
+                    )[:batch_size]
+                )
+                if post_ids:
+                    if pool is None:
+                        list(map(run_safely, post_ids))
+                    else:
+                        list(pool.map(run_in_thread, post_ids))
+                    processed += len(post_ids)
+                    last_id = post_ids[-1]
+                    if verbosity > 1:
+                        self.stdout.write(f"Обработано: {processed}")
+                elif loop:
+                    last_id = 0
+                    time.sleep(interval)
+                else:
+                    break
+        if verbosity:
+            self.stdout.write(
+                self.style.SUCCESS(f"Обработано картинок: {processed}")
+            )
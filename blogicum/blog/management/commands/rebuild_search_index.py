@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Перестраивает поисковый индекс публикаций. Нужен после загрузки "
+        "данных в обход сигналов (bulk_create, update(), raw SQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(using=options["database"]):
+            get_search_backend(options["database"]).rebuild()
+        if options["verbosity"]:
+            self.stdout.write(self.style.SUCCESS("Поисковый индекс обновлён."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает Post.comment_count по таблице комментариев."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Сколько публикаций обновлять одним UPDATE.",
+        )
+
+    def handle(self, *args, batch_size, verbosity, **options):
+        counts = (
+            Comment.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        last_id = Post.objects.aggregate(last=Max("pk"))["last"] or 0
+        updated = 0
+        for start in range(0, last_id, batch_size):
+            with transaction.atomic():
+                updated += Post.objects.filter(
+                    pk__gt=start, pk__lte=start + batch_size
+                ).update(comment_count=Coalesce(Subquery(counts), 0))
+        if verbosity:
+            self.stdout.write(
+                self.style.SUCCESS(f"Пересчитано публикаций: {updated}")
+            )
@@ -0,0 +1,75 @@
+import os
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.seeding import seed_blog
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими пользователями, категориями, "
+        "местоположениями, публикациями и комментариями (Faker + "
+        "bulk_create). Одинаковые --seed и --batch-size дают одинаковые "
+        "данные при любом числе воркеров."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--locations", type=int, default=100)
+        parser.add_argument("--posts", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=100000)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Строк в одной пачке генерации и bulk_create.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Число процессов, генерирующих данные.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        volumes = {
+            name: options[name]
+            for name in ("users", "categories", "locations", "posts",
+                         "comments")
+        }
+        if any(value < 0 for value in volumes.values()):
+            raise CommandError("Объёмы не могут быть отрицательными.")
+        if volumes["posts"] and not (
+            volumes["users"] and volumes["categories"]
+        ):
+            raise CommandError(
+                "Для публикаций нужны хотя бы один пользователь и категория."
+            )
+        if volumes["comments"] and not (
+            volumes["users"] and volumes["posts"]
+        ):
+            raise CommandError(
+                "Для комментариев нужны пользователи и публикации."
+            )
+        if options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--batch-size и --workers должны быть > 0.")
+
+        started = perf_counter()
+        log = self.stdout.write if options["verbosity"] > 1 else None
+        seed_blog(
+            **volumes,
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            workers=options["workers"],
+            log=log,
+        )
+        if options["verbosity"]:
+            created = ", ".join(
+                f"{name}: {value}" for name, value in volumes.items()
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Создано за {perf_counter() - started:.1f} с — {created}"
+            ))
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:02
+
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5("
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+)
+SQLITE_FILL = (
+    "INSERT INTO blog_post_fts (rowid, title, text) "
+    "SELECT id, title, text FROM blog_post"
+)
+SQLITE_DROP = "DROP TABLE IF EXISTS blog_post_fts"
+POSTGRESQL_CREATE = (
+    "CREATE INDEX IF NOT EXISTS blog_post_search_idx ON blog_post "
+    "USING gin (to_tsvector('russian', title || ' ' || text))"
+)
+POSTGRESQL_DROP = "DROP INDEX IF EXISTS blog_post_search_idx"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(SQLITE_FILL)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRESQL_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_DROP)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRESQL_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
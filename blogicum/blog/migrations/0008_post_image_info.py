@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_info',
+            field=models.JSONField(default=dict, editable=False, help_text='Размеры оригинала и ширины его уменьшенных копий.', verbose_name='Сведения о картинке'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:35
+
+from django.db import migrations, models
+
+
+def fill_image_status(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    with_image = Post.objects.exclude(image='')
+    with_image.exclude(image_info={}).update(image_status='ready')
+    # Картинки без копий подберёт команда process_images.
+    with_image.filter(image_info={}).update(image_status='processing')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_image_info'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('', 'Нет картинки'), ('processing', 'Обрабатывается'), ('ready', 'Готова'), ('failed', 'Не удалось обработать')], default='', editable=False, max_length=16, verbose_name='Обработка картинки'),
+        ),
+        migrations.RunPython(fill_image_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('image_status', 'processing')), fields=['id'], name='post_image_processing_idx'),
+        ),
+    ]
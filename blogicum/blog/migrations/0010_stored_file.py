@@ -0,0 +1,54 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:40
+
+from django.core.files.storage import FileSystemStorage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    StoredFile = apps.get_model('blog', 'StoredFile')
+    storage = FileSystemStorage()
+    references = (
+        Post.objects.exclude(image='')
+        .values('image')
+        .annotate(references=Count('id'))
+        .order_by()
+    )
+    stored = []
+    for row in references.iterator():
+        try:
+            size = storage.size(row['image'])
+        except OSError:
+            size = 0
+        stored.append(
+            StoredFile(
+                name=row['image'], size=size, references=row['references']
+            )
+        )
+    StoredFile.objects.bulk_create(stored, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_image_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Имя файла')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Размер, байт')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='Количество ссылок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'файл',
+                'verbose_name_plural': 'Файлы',
+            },
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_stored_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Меняется и при правке комментариев к публикации.', verbose_name='Изменено'),
+        ),
+    ]
@@ -13,11 +13,14 @@ class PostMixin:
     pk_url_kwarg = "post_id"
 
     def dispatch(self, request, *args, **kwargs):
-        post = get_object_or_404(Post, pk=kwargs.get("post_id"))
-        if self.request.user != post.author:
+        self.instance = get_object_or_404(Post, pk=kwargs.get("post_id"))
+        if self.instance.author_id != self.request.user.pk:
             return redirect('blog:post_detail', self.kwargs.get("post_id"))
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.instance
+
 
 class CommentMixin:
     model = Comment
@@ -25,17 +28,21 @@ class CommentMixin:
     template_name = "blog/comment.html"
     pk_url_kwarg = "comment_id"
     comment_id_kwarg = "comment_id"
+    instance = None
 
     def dispatch(self, request, *args, **kwargs):
         if self.comment_id_kwarg in kwargs:
-            comment = get_object_or_404(
+            self.instance = get_object_or_404(
                 Comment,
                 pk=kwargs.get(self.comment_id_kwarg)
             )
-            if self.request.user != comment.author:
+            if self.instance.author_id != self.request.user.pk:
                 raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.instance
+
     def get_success_url(self):
         return reverse_lazy(
             "blog:post_detail", kwargs={"post_id": self.kwargs.get("post_id")}
@@ -40,6 +40,12 @@ class Location(PublishedAndCreatedModel):
 
 
 class Post(PublishedAndCreatedModel):
+    class ImageStatus(models.TextChoices):
+        NONE = "", "Нет картинки"
+        PROCESSING = "processing", "Обрабатывается"
+        READY = "ready", "Готова"
+        FAILED = "failed", "Не удалось обработать"
+
     title = models.CharField("Заголовок", max_length=MAX_LENGTH_CHARFIELD)
     text = models.TextField("Текст")
     pub_date = models.DateTimeField(
@@ -71,11 +77,57 @@ class Post(PublishedAndCreatedModel):
     )
 
     image = models.ImageField("Картинка", blank=True)
+    image_info = models.JSONField(
+        "Сведения о картинке",
+        default=dict,
+        editable=False,
+        help_text="Размеры оригинала и ширины его уменьшенных копий.",
+    )
+    image_status = models.CharField(
+        "Обработка картинки",
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.NONE,
+        blank=True,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=0, editable=False
+    )
+    updated_at = models.DateTimeField(
+        "Изменено",
+        auto_now=True,
+        help_text="Меняется и при правке комментариев к публикации.",
+    )
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("is_published", "-pub_date"),
+                name="post_published_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="post_author_pub_date_idx",
+            ),
+            models.Index(
+                fields=("category", "is_published", "-pub_date", "-id"),
+                name="post_category_pub_date_idx",
+            ),
+            models.Index(
+                fields=("-pub_date", "-id"),
+                name="post_visible_feed_idx",
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=("id",),
+                name="post_image_processing_idx",
+                condition=models.Q(image_status="processing"),
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
@@ -98,6 +150,28 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at"),
+                name="comment_post_created_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.text
+
+
+class StoredFile(models.Model):
+    """Счётчик ссылок на файл в хранилище с адресацией по содержимому."""
+
+    name = models.CharField("Имя файла", max_length=255, unique=True)
+    size = models.PositiveBigIntegerField("Размер, байт", default=0)
+    references = models.PositiveIntegerField("Количество ссылок", default=0)
+    created_at = models.DateTimeField("Добавлено", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "файл"
+        verbose_name_plural = "Файлы"
+
+    def __str__(self) -> str:
+        return self.name
@@ -0,0 +1,296 @@
+import base64
+import binascii
+import json
+from collections.abc import Mapping, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from blog.cache import get_cache, get_versions
+from blog.constants import FEED_COUNT_TIMEOUT, FEED_COUNT_VERSION
+from core.routers import served_from_replica
+
+
+class CursorPage(Sequence):
+    """Страница ленты, полученная по курсору, а не по номеру."""
+
+    is_cursor_page = True
+
+    def __init__(
+        self, object_list, paginator, has_next, has_previous
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} items>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], "prev")
+
+
+class CursorPaginator:
+    """Keyset-пагинация по уникальному набору полей сортировки.
+
+    В отличие от ``Paginator`` не выполняет ``COUNT(*)`` и ``OFFSET``:
+    каждая страница выбирается условием «строго после/до курсора»,
+    поэтому глубокие страницы стоят столько же, сколько первая.
+    Последнее поле ``ordering`` должно быть уникальным (обычно ``pk``).
+    """
+
+    def __init__(self, object_list, per_page, ordering=("-pub_date", "-pk")):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip("-") for name in self.ordering]
+        self.descending = self.ordering[0].startswith("-")
+
+    def _model_field(self, name):
+        opts = self.object_list.model._meta
+        return opts.pk if name == "pk" else opts.get_field(name)
+
+    def _cursor_value(self, obj, name):
+        if isinstance(obj, Mapping):
+            # Строка из values(): ключи совпадают с полями сортировки.
+            value = obj[name]
+            return value.isoformat() if hasattr(value, "isoformat") else value
+        return self._model_field(name).value_to_string(obj)
+
+    def encode_cursor(self, obj, direction):
+        values = [self._cursor_value(obj, name) for name in self.fields]
+        payload = json.dumps([direction, values]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Возвращает ``(direction, values)`` или ``None`` для мусора."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, raw_values = json.loads(
+                base64.urlsafe_b64decode(padded.encode())
+            )
+            if direction not in ("next", "prev"):
+                return None
+            if len(raw_values) != len(self.fields):
+                return None
+            values = [
+                self._model_field(name).to_python(value)
+                for name, value in zip(self.fields, raw_values)
+            ]
+        except (
+            TypeError, ValueError, binascii.Error, ValidationError
+        ):
+            return None
+        if any(value is None for value in values):
+            return None
+        return direction, values
+
+    def _after(self, values, forward):
+        lookup = "lt" if forward == self.descending else "gt"
+        condition = Q()
+        for index, name in enumerate(self.fields):
+            step = Q(**{f"{name}__{lookup}": values[index]})
+            for prev_name, prev_value in zip(
+                self.fields[:index], values[:index]
+            ):
+                step &= Q(**{prev_name: prev_value})
+            condition |= step
+        return condition
+
+    def get_page(self, cursor=None):
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            direction, values = "next", None
+        else:
+            direction, values = decoded
+        forward = direction == "next"
+        ordering = self.ordering
+        queryset = self.object_list
+        if values is not None:
+            queryset = queryset.filter(self._after(values, forward))
+        if not forward:
+            ordering = tuple(
+                name[1:] if name.startswith("-") else f"-{name}"
+                for name in ordering
+            )
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if forward:
+            return CursorPage(rows, self, has_more, values is not None)
+        rows.reverse()
+        return CursorPage(rows, self, True, has_more)
+
+
+class FeedPaginator(Paginator):
+    """Постраничная пагинация с точным ``COUNT(*)``.
+
+    ``feed_key`` идентифицирует ленту для стратегий, которые
+    кэшируют или оценивают количество записей.
+    """
+
+    def __init__(self, object_list, per_page, feed_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed_key = feed_key
+
+
+class CachedCountPaginator(FeedPaginator):
+    """Хранит количество записей ленты в кэше.
+
+    Версия ``FEED_COUNT_VERSION`` меняется при сохранении и удалении
+    публикаций и категорий, а таймаут ограничивает устаревание из-за
+    отложенных публикаций, которые становятся видимыми сами по себе.
+    """
+
+    def _cached_count(self):
+        if self.feed_key is None:
+            return super().count
+        version = get_versions(FEED_COUNT_VERSION)[FEED_COUNT_VERSION]
+        key = f"blog:count:{self.feed_key}:{version}"
+        cache = get_cache()
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            if served_from_replica():
+                return count
+            cache.set(
+                key,
+                count,
+                getattr(
+                    settings, "BLOG_FEED_COUNT_TIMEOUT", FEED_COUNT_TIMEOUT
+                ),
+            )
+        return count
+
+    @cached_property
+    def count(self):
+        return self._cached_count()
+
+
+def estimate_count(queryset):
+    """Оценка числа строк по плану запроса; ``None``, если её нет.
+
+    PostgreSQL отдаёт оценку планировщика через ``EXPLAIN``. У SQLite
+    планировщик не возвращает числа строк, поэтому для него оценки нет.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+    """Берёт количество из оценки планировщика.
+
+    Где оценка недоступна (SQLite), используется кэшированный подсчёт.
+    Оценка может расходиться с реальностью, поэтому последние страницы
+    при заниженной оценке недостижимы по номеру.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None:
+            return self._cached_count()
+        return estimate
+
+
+class UncountedPage(Page):
+    """Страница без общего количества: известно лишь, есть ли следующая."""
+
+    is_uncounted = True
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def __repr__(self):
+        return f"<Page {self.number}>"
+
+    def has_next(self):
+        return self._has_next
+
+    # Page.start_index и end_index обращаются к paginator.count, а
+    # смысл этой страницы — обойтись без COUNT(*).
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return (self.number - 1) * self.paginator.per_page + len(
+            self.object_list
+        )
+
+
+class NoCountPaginator(FeedPaginator):
+    """Выбирает ``per_page + 1`` строк вместо ``COUNT(*)``."""
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def get_page(self, number):
+        try:
+            number = self.validate_number(number)
+        except (PageNotAnInteger, EmptyPage):
+            number = 1
+        return self.page(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return UncountedPage(
+            rows[:self.per_page], number, self, len(rows) > self.per_page
+        )
+
+
+COUNT_STRATEGIES = {
+    "exact": FeedPaginator,
+    "cached": CachedCountPaginator,
+    "estimated": EstimatedCountPaginator,
+    "has_next": NoCountPaginator,
+}
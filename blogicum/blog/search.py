@@ -0,0 +1,165 @@
+"""Полнотекстовый поиск по заголовку и тексту публикаций.
+
+Индекс зависит от СУБД: в SQLite это отдельная таблица FTS5, которую
+обновляют сигналы ``Post``, в PostgreSQL — GIN-индекс по выражению
+``to_tsvector``, который база поддерживает сама. На прочих СУБД поиск
+сводится к ``icontains`` без индекса.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from blog.constants import (
+    FEED_ORDERING,
+    SEARCH_MAX_TERMS,
+    SEARCH_RANK_WINDOW,
+)
+
+FTS_TABLE = "blog_post_fts"
+PG_CONFIG = "russian"
+PG_DOCUMENT = (
+    f"to_tsvector('{PG_CONFIG}', blog_post.title || ' ' || blog_post.text)"
+)
+WORD_RE = re.compile(r"\w+")
+
+
+def get_terms(query):
+    """Слова запроса без операторов и кавычек, не больше лимита."""
+    return WORD_RE.findall(query.lower())[:SEARCH_MAX_TERMS]
+
+
+class SearchBackend:
+    """Поиск без индекса: все слова должны встретиться в публикации."""
+
+    def search(self, queryset, query):
+        condition = Q()
+        for term in get_terms(query):
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return queryset.filter(condition).order_by(*FEED_ORDERING)
+
+    def index_post(self, post):
+        pass
+
+    def remove_post(self, post_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """FTS5 с ранжированием по bm25; заголовок весит больше текста.
+
+    Сам MATCH дешёв, а bm25 приходится считать для каждого совпадения —
+    на частых словах это десятки миллисекунд. Поэтому ранжируются только
+    ``SEARCH_RANK_WINDOW`` самых новых совпадений: граница окна ищется
+    по rowid без ранжирования. Совпадения старше окна не теряются, а
+    идут после ранжированных, от новых к старым.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def search(self, queryset, query):
+        *terms, last = get_terms(query)
+        # Последнее слово может быть недописано — ищем его как префикс.
+        match = " ".join([*(f'"{term}"' for term in terms), f'"{last}"*'])
+        window_start = (
+            f"COALESCE((SELECT rowid FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY rowid DESC "
+            f"LIMIT 1 OFFSET {SEARCH_RANK_WINDOW - 1}), 0)"
+        )
+        in_window = f"{FTS_TABLE}.rowid >= {window_start}"
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f"{FTS_TABLE}.rowid = blog_post.id",
+                f"{FTS_TABLE} MATCH %s",
+            ],
+            params=[match],
+            # CASE не вызывает bm25 для строк вне окна; подзапрос границы
+            # не зависит от строки, и SQLite вычисляет его один раз.
+            select={
+                "in_window": in_window,
+                "rank": (
+                    f"CASE WHEN {in_window} "
+                    f"THEN bm25({FTS_TABLE}, 10.0, 1.0) END"
+                ),
+            },
+            select_params=[match, match],
+        ).order_by("-in_window", "rank", *FEED_ORDERING)
+
+    def index_post(self, post):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk]
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, text) "
+                "VALUES (%s, %s, %s)",
+                [post.pk, post.title, post.text],
+            )
+
+    def remove_post(self, post_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id]
+            )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, text) "
+                "SELECT id, title, text FROM blog_post"
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"
+            )
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """Префиксный ``to_tsquery`` по GIN-индексу ``blog_post_search_idx``."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def search(self, queryset, query):
+        tsquery = f"to_tsquery('{PG_CONFIG}', %s)"
+        *terms, last = get_terms(query)
+        match = " & ".join([*terms, f"{last}:*"])
+        return queryset.extra(
+            where=[f"{PG_DOCUMENT} @@ {tsquery}"],
+            params=[match],
+            select={"rank": f"ts_rank({PG_DOCUMENT}, {tsquery})"},
+            select_params=[match],
+        ).order_by("-rank", "-pk")
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("REINDEX INDEX blog_post_search_idx")
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend(using="default"):
+    connection = connections[using]
+    backend_class = SEARCH_BACKENDS.get(connection.vendor)
+    if backend_class is None:
+        return SearchBackend()
+    return backend_class(connection)
+
+
+def search_posts(queryset, query):
+    """Публикации из ``queryset``, найденные по ``query``, по релевантности.
+
+    Пустой запрос ничего не находит.
+    """
+    if not get_terms(query):
+        return queryset.none()
+    return get_search_backend(queryset.db).search(queryset, query)
@@ -0,0 +1,151 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.fake_data import generate_chunk
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+def ordered_map(pool, func, items, window):
+    """``map`` по пулу процессов с не более чем ``window`` задачами в работе.
+
+    Без ограничения готовые пачки копились бы в памяти быстрее, чем
+    база успевает их вставлять.
+    """
+    if pool is None:
+        yield from map(func, items)
+        return
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class Seeder:
+    """Заполняет базу синтетическими данными пачками ``bulk_create``.
+
+    Строки генерируют процессы-воркеры (Faker заметно медленнее
+    вставки), а вставляет их текущий процесс по порядку пачек — так
+    одинаковый ``seed`` и ``batch_size`` дают одинаковые данные при
+    любом числе воркеров и не создают конкурирующих писателей в SQLite.
+    """
+
+    def __init__(self, batch_size=5000, seed=0, workers=1, log=None):
+        self.batch_size = batch_size
+        self.seed = seed
+        self.workers = workers
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.password = make_password(None)
+        self.refs = {}
+        self.pool = None
+
+    def insert(self, kind, model, total, build):
+        """Создаёт ``total`` объектов; возвращает их id в порядке генерации."""
+        last_pk = model.objects.aggregate(last=Max("pk"))["last"] or 0
+        tasks = (
+            (
+                kind,
+                self.seed,
+                chunk,
+                last_pk + start,
+                min(self.batch_size, total - start),
+                self.refs,
+            )
+            for chunk, start in enumerate(range(0, total, self.batch_size))
+        )
+        created = 0
+        for rows in ordered_map(
+            self.pool, generate_chunk, tasks, self.workers * 2
+        ):
+            model.objects.bulk_create(
+                [build(row) for row in rows], batch_size=self.batch_size
+            )
+            created += len(rows)
+            self.log(f"{kind}: {created}/{total}")
+        self.refs[kind] = total
+        return list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def run(self, users, categories, locations, posts, comments):
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        with pool or nullcontext():
+            self.pool = pool
+            user_ids = self.insert(
+                "users", User, users,
+                lambda row: User(password=self.password, **row),
+            )
+            category_ids = self.insert(
+                "categories", Category, categories,
+                lambda row: Category(**row),
+            )
+            location_ids = self.insert(
+                "locations", Location, locations,
+                lambda row: Location(**row),
+            )
+            location_ids.append(None)
+            post_ids = self.insert(
+                "posts", Post, posts,
+                lambda row: Post(
+                    title=row["title"],
+                    text=row["text"],
+                    pub_date=self.now - timedelta(minutes=row["minutes_ago"]),
+                    author_id=user_ids[row["author"]],
+                    category_id=category_ids[row["category"]],
+                    location_id=location_ids[row["location"]],
+                    is_published=row["is_published"],
+                ),
+            )
+            self.insert(
+                "comments", Comment, comments,
+                lambda row: Comment(
+                    text=row["text"],
+                    post_id=post_ids[row["post"]],
+                    author_id=user_ids[row["author"]],
+                ),
+            )
+            self.pool = None
+        # bulk_create не вызывает сигналы, поэтому счётчики и поисковый
+        # индекс — отдельно.
+        call_command(
+            "recount_comments", batch_size=self.batch_size, verbosity=0
+        )
+        call_command("rebuild_search_index", verbosity=0)
+
+
+def seed_blog(
+    users=100,
+    categories=10,
+    locations=20,
+    posts=1000,
+    comments=10000,
+    batch_size=5000,
+    seed=0,
+    workers=1,
+    log=None,
+):
+    Seeder(batch_size, seed, workers, log).run(
+        users, categories, locations, posts, comments
+    )
+    return {
+        "users": users,
+        "categories": categories,
+        "locations": locations,
+        "posts": posts,
+        "comments": comments,
+    }
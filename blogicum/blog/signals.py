@@ -0,0 +1,187 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.cache import (
+    bump_versions,
+    get_feed_page_timeout,
+    invalidate_feed_pages,
+)
+from blog.constants import FEED_COUNT_VERSION, FEED_PAGE_VERSION
+from blog.images import release_image
+from blog.models import Category, Comment, Location, Post
+from blog.search import get_search_backend
+from blog.tasks import enqueue_post_image
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_feed_counts(sender, **kwargs):
+    bump_versions(FEED_COUNT_VERSION)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1, updated_at=timezone.now()
+        )
+        bump_versions(f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=Comment)
+def touch_commented_post(sender, instance, created, **kwargs):
+    """Правка комментария меняет Last-Modified страницы публикации."""
+    if not created:
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        updated_at=timezone.now(),
+    )
+    bump_versions(f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_post_cards(sender, instance, **kwargs):
+    names = {
+        Post: "post",
+        Category: "category",
+        Location: "location",
+        User: "user",
+    }
+    bump_versions(f"{names[sender]}:{instance.pk}")
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_feeds(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    instance._previous_feeds = Post.objects.filter(pk=instance.pk).values_list(
+        "category_id", "author_id"
+    ).first()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feed_pages(sender, instance, **kwargs):
+    if not get_feed_page_timeout():
+        return
+    post_feeds = {(instance.category_id, instance.author_id)}
+    previous = getattr(instance, "_previous_feeds", None)
+    if previous is not None:
+        post_feeds.add(previous)
+    invalidate_feed_pages(post_feeds)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_syndication_feeds(sender, instance, **kwargs):
+    post_feeds = {(instance.category_id, instance.author_id)}
+    previous = getattr(instance, "_previous_feeds", None)
+    if previous is not None:
+        post_feeds.add(previous)
+    bump_versions(
+        *{f"syndication:category:{category_id}"
+          for category_id, _ in post_feeds},
+        *{f"syndication:author:{author_id}" for _, author_id in post_feeds},
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_feed_pages(sender, instance, created=True, **kwargs):
+    if not created or not get_feed_page_timeout():
+        return
+    post_feeds = Post.objects.filter(pk=instance.post_id).values_list(
+        "category_id", "author_id"
+    )
+    invalidate_feed_pages(set(post_feeds))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_all_feed_pages(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    # Версия входит и в ETag страниц, поэтому меняется даже без кэша.
+    bump_versions(FEED_PAGE_VERSION)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, using, update_fields=None, **kwargs):
+    if update_fields is not None and not {"title", "text"} & set(
+        update_fields
+    ):
+        return
+    get_search_backend(using).index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, using, **kwargs):
+    get_search_backend(using).remove_post(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def mark_image_for_processing(sender, instance, update_fields=None,
+                              **kwargs):
+    """Ставит новую картинку в очередь обработки тем же сохранением."""
+    if update_fields is not None and "image" not in update_fields:
+        return
+    previous = None
+    if instance.pk is not None:
+        previous = Post.objects.filter(pk=instance.pk).values_list(
+            "image", "image_info"
+        ).first()
+    previous_name, previous_info = previous or ("", {})
+    if (instance.image.name or "") == previous_name:
+        return
+    instance._previous_image = (previous_name, previous_info)
+    instance.image_info = {}
+    instance.image_status = (
+        Post.ImageStatus.PROCESSING if instance.image
+        else Post.ImageStatus.NONE
+    )
+
+
+@receiver(post_save, sender=Post)
+def process_post_image(sender, instance, using, raw=False, **kwargs):
+    previous = instance.__dict__.pop("_previous_image", None)
+    if raw or previous is None:
+        return
+    previous_name, previous_info = previous
+    if previous_name:
+        release_image(previous_name, previous_info, instance.image.storage)
+    if instance.image:
+        enqueue_post_image(instance.pk, using)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    if instance.image:
+        release_image(
+            instance.image.name, instance.image_info, instance.image.storage
+        )
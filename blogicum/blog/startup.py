@@ -0,0 +1,71 @@
+"""Старт процесса и первые запросы под заданным профилем настроек.
+
+Профиль настроек нельзя сменить внутри процесса, поэтому замер идёт в
+новом процессе::
+
+    DJANGO_SETTINGS_MODULE=<профиль> python -m blog.startup <база> <запросов>
+
+Процесс поднимает WSGI-приложение на копии базы, ``<запросов>`` раз
+открывает каждую страницу для чтения и печатает JSON: время старта,
+пиковый RSS после старта и после запросов, первый (холодный: шаблоны
+ещё не скомпилированы) и последующие запросы каждой страницы. Django
+импортируется только здесь — до подмены базы в настройках.
+"""
+import json
+import resource
+import sys
+from time import perf_counter
+
+STARTED = perf_counter()
+
+
+def peak_rss_mb():
+    # В Linux ru_maxrss — в КиБ.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(database, requests):
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = database
+    from django.core.wsgi import get_wsgi_application
+
+    handler = get_wsgi_application()
+    startup = perf_counter() - STARTED
+    rss_startup = peak_rss_mb()
+
+    from django.contrib.auth import get_user_model
+
+    from blog.benchmark import BenchmarkError, summarize
+    from blog.concurrency import (
+        get_read_urls,
+        get_session_cookie,
+        wsgi_request,
+    )
+
+    user, _ = get_user_model().objects.get_or_create(username="benchmark")
+    cookie = get_session_cookie(user)
+    pages = {}
+    for name, path in get_read_urls(user).items():
+        timings = []
+        for _ in range(requests):
+            status, elapsed = wsgi_request(handler, path, cookie)
+            if status >= 400:
+                raise BenchmarkError(f"GET {path} вернул {status}")
+            timings.append(elapsed)
+        warm = summarize(timings[1:] or timings, [])
+        pages[name] = {
+            "first_ms": timings[0] * 1000,
+            "median_ms": warm["median_ms"],
+            "p95_ms": warm["p95_ms"],
+        }
+    return {
+        "startup_s": startup,
+        "rss_startup_mb": rss_startup,
+        "rss_peak_mb": peak_rss_mb(),
+        "pages": pages,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(measure(sys.argv[1], int(sys.argv[2]))))
@@ -0,0 +1,170 @@
+"""Файловое хранилище с адресацией по содержимому.
+
+Загруженный файл хешируется (SHA-256) по частям прямо во время записи во
+временный файл и сохраняется под именем ``images/<ab>/<хеш><расширение>``.
+Одинаковые загрузки получают одно имя и занимают место на диске один
+раз; сколько ссылок у файла, хранит ``StoredFile``. ``delete`` снимает
+одну ссылку, а сам файл удаляется вместе с последней.
+
+Содержимое файла под таким именем никогда не меняется, поэтому его
+можно кэшировать навсегда — см. ``is_immutable``.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+from blog.constants import MEDIA_HASH_CHUNK_SIZE, MEDIA_HASHED_DIR
+from blog.models import StoredFile
+
+HASHED_NAME_RE = re.compile(
+    rf"^{MEDIA_HASHED_DIR}/[0-9a-f]{{2}}/[0-9a-f]{{64}}\.\w+$"
+)
+INCOMING_DIR = ".incoming"
+
+
+def is_immutable(name):
+    return bool(HASHED_NAME_RE.match(name))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    def hashed_name(self, name, digest):
+        extension = os.path.splitext(name)[1].lower()
+        return f"{MEDIA_HASHED_DIR}/{digest[:2]}/{digest}{extension}"
+
+    @property
+    def variant_storage(self):
+        """Обычное хранилище в том же каталоге — для производных файлов.
+
+        Имена уменьшенных копий выводятся из имени оригинала, поэтому
+        адресовать их по содержимому не нужно.
+        """
+        return FileSystemStorage(
+            location=self.location,
+            base_url=self.base_url,
+            file_permissions_mode=self.file_permissions_mode,
+            directory_permissions_mode=self.directory_permissions_mode,
+        )
+
+    def get_available_name(self, name, max_length=None):
+        # Итоговое имя определяет содержимое, а не порядок загрузок.
+        return name
+
+    def makedirs(self, directory):
+        if self.directory_permissions_mode is None:
+            os.makedirs(directory, exist_ok=True)
+            return
+        old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+        try:
+            os.makedirs(
+                directory, self.directory_permissions_mode, exist_ok=True
+            )
+        finally:
+            os.umask(old_umask)
+
+    def spool(self, content):
+        """Копирует ``content`` во временный файл, считая его хеш.
+
+        Возвращает ``(путь, хеш, размер)``; файл за один проход и
+        записывается, и хешируется, поэтому память не зависит от его
+        размера.
+        """
+        incoming = self.path(INCOMING_DIR)
+        self.makedirs(incoming)
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in content.chunks(MEDIA_HASH_CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    size += len(chunk)
+                    file.write(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return temp_path, digest.hexdigest(), size
+
+    def _save(self, name, content):
+        temp_path, digest, size = self.spool(content)
+        name = self.hashed_name(name, digest)
+        full_path = self.path(name)
+        # Ссылка берётся раньше, чем файл кладётся на место, и в той же
+        # транзакции: одновременный release того же имени ждёт её и не
+        # удалит файл, который только что снова понадобился.
+        with transaction.atomic():
+            self.acquire(name, size)
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+                # Файл снова в деле: collect_media смотрит на mtime и
+                # не должен принять его за давнего сироту.
+                os.utime(full_path, None)
+            else:
+                self.makedirs(os.path.dirname(full_path))
+                # Атомарно: одновременная загрузка того же файла
+                # перезапишет его тем же содержимым.
+                os.replace(temp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def acquire(self, name, size=0):
+        updated = StoredFile.objects.filter(name=name).update(
+            references=F("references") + 1
+        )
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                StoredFile.objects.create(name=name, size=size, references=1)
+        except IntegrityError:
+            StoredFile.objects.filter(name=name).update(
+                references=F("references") + 1
+            )
+
+    def release(self, name):
+        """Снимает ссылку; возвращает ``True``, если файл удалён.
+
+        Файл без учётной записи (загруженный мимо хранилища) не
+        удаляется: неизвестно, кто ещё на него ссылается.
+        """
+        with transaction.atomic():
+            # UPDATE блокирует строку (в SQLite — всю базу на запись) до
+            # конца транзакции, поэтому acquire того же имени дождётся,
+            # пока файл будет удалён, и положит его заново.
+            StoredFile.objects.filter(name=name, references__gt=0).update(
+                references=F("references") - 1
+            )
+            deleted, _ = StoredFile.objects.filter(
+                name=name, references=0
+            ).delete()
+            if deleted:
+                super().delete(name)
+        return bool(deleted)
+
+    def delete(self, name):
+        self.release(name)
+
+
+def get_variant_storage(storage):
+    return getattr(storage, "variant_storage", storage)
+
+
+def release_file(storage, name):
+    """Снимает ссылку на файл; ``True``, если файла больше нет.
+
+    Обычные хранилища ссылок не считают и просто удаляют файл.
+    """
+    release = getattr(storage, "release", None)
+    if release is None:
+        storage.delete(name)
+        return True
+    return release(name)
@@ -0,0 +1,140 @@
+"""Фоновая обработка картинок публикаций.
+
+Очередь хранится в базе: публикация с новой картинкой сохраняется со
+статусом ``processing`` и без ``image_info``, поэтому до конца обработки
+шаблоны показывают оригинал. Что делать с задачей, решает настройка
+``BLOG_IMAGE_PROCESSING``:
+
+* ``thread`` — после коммита отправить в пул потоков текущего процесса
+  (Pillow отпускает GIL при декодировании, масштабировании и сжатии);
+* ``worker`` — ничего, задачу заберёт команда ``process_images``;
+* ``sync`` — обработать сразу, в том же запросе.
+
+Задачи, потерянные при перезапуске процесса, тоже подбирает
+``process_images``.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from blog.cache import (
+    bump_versions,
+    get_feed_page_timeout,
+    invalidate_feed_pages,
+)
+from blog.constants import IMAGE_PROCESSING, IMAGE_PROCESSING_WORKERS
+from blog.images import (
+    IMAGE_ERRORS,
+    get_variant_names,
+    process_image,
+    release_image,
+)
+from blog.models import Post
+from blog.storage import get_variant_storage
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings,
+                    "BLOG_IMAGE_PROCESSING_WORKERS",
+                    IMAGE_PROCESSING_WORKERS,
+                ),
+                thread_name_prefix="blog-images",
+            )
+        return _executor
+
+
+def process_post_image(post_id):
+    """Обрабатывает картинку публикации, если она ещё ждёт обработки.
+
+    Возвращает итоговый статус или ``None``, если ждать было нечего.
+    Результат записывается, только если картинку не успели сменить:
+    иначе им займётся задача, поставленная новой картинкой.
+    """
+    post = (
+        Post.objects.filter(
+            pk=post_id, image_status=Post.ImageStatus.PROCESSING
+        )
+        .only("pk", "image", "image_info", "category_id", "author_id")
+        .first()
+    )
+    if post is None:
+        return None
+    name = new_name = post.image.name
+    storage = post.image.storage
+    info = {}
+    status = Post.ImageStatus.NONE
+    if name:
+        try:
+            new_name, info = process_image(name, storage)
+            status = Post.ImageStatus.READY
+        except IMAGE_ERRORS:
+            logger.warning(
+                "Не удалось обработать картинку %s", name, exc_info=True
+            )
+            status = Post.ImageStatus.FAILED
+    updated = Post.objects.filter(
+        pk=post_id, image=name, image_status=Post.ImageStatus.PROCESSING
+    ).update(
+        image=new_name,
+        image_status=status,
+        image_info=info,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        if new_name != name:
+            release_image(new_name, info, storage)
+        return None
+    if new_name != name:
+        release_image(name, post.image_info, storage)
+    else:
+        # Копии прежнего формата или ширин, которых теперь нет.
+        stale = set(get_variant_names(name, post.image_info).values())
+        stale -= set(get_variant_names(name, info).values())
+        variant_storage = get_variant_storage(storage)
+        for variant in stale:
+            variant_storage.delete(variant)
+    bump_versions(f"post:{post_id}")
+    if get_feed_page_timeout():
+        invalidate_feed_pages({(post.category_id, post.author_id)})
+    return status
+
+
+def run_safely(post_id):
+    try:
+        return process_post_image(post_id)
+    except Exception:
+        logger.exception("Ошибка фоновой обработки публикации %s", post_id)
+        return None
+
+
+def run_in_thread(post_id):
+    """``run_safely`` для чужого потока: закрывает его соединения с БД."""
+    try:
+        return run_safely(post_id)
+    finally:
+        connections.close_all()
+
+
+def enqueue_post_image(post_id, using=DEFAULT_DB_ALIAS):
+    mode = getattr(settings, "BLOG_IMAGE_PROCESSING", IMAGE_PROCESSING)
+    if mode == "sync":
+        process_post_image(post_id)
+    elif mode == "thread":
+        transaction.on_commit(
+            lambda: get_executor().submit(run_in_thread, post_id),
+            using=using,
+        )
@@ -0,0 +1,42 @@
+from django import template
+from django.conf import settings
+
+from blog.cache import get_cache, get_post_card_key
+from blog.constants import POST_CARD_CACHE_TIMEOUT
+from core.routers import served_from_replica
+
+register = template.Library()
+
+
+class PostCardCacheNode(template.Node):
+    def __init__(self, nodelist, post):
+        self.nodelist = nodelist
+        self.post = post
+
+    def render(self, context):
+        timeout = getattr(
+            settings, "BLOG_POST_CARD_CACHE_TIMEOUT", POST_CARD_CACHE_TIMEOUT
+        )
+        if not timeout:
+            return self.nodelist.render(context)
+        key = get_post_card_key(self.post.resolve(context))
+        cache = get_cache()
+        html = cache.get(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            if not served_from_replica():
+                cache.set(key, html, timeout)
+        return html
+
+
+@register.tag
+def cache_post_card(parser, token):
+    """Кэширует карточку публикации: ``{% cache_post_card post %}``."""
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires exactly one argument."
+        )
+    nodelist = parser.parse(("endcache_post_card",))
+    parser.delete_first_token()
+    return PostCardCacheNode(nodelist, parser.compile_filter(bits[1]))
@@ -0,0 +1,45 @@
+from django import template
+
+from blog.constants import (
+    IMAGE_DETAIL_WIDTH,
+    IMAGE_FEED_WIDTH,
+    IMAGE_VARIANT_WIDTHS,
+)
+from blog.images import get_variant_names
+
+register = template.Library()
+
+# Ширина копии для src и атрибут sizes: карточка шириной 40rem.
+IMAGE_SIZES = {
+    "feed": (IMAGE_FEED_WIDTH, "(max-width: 40rem) 100vw, 40rem"),
+    "detail": (IMAGE_DETAIL_WIDTH, "(max-width: 40rem) 100vw, 40rem"),
+}
+
+
+@register.inclusion_tag("includes/post_image.html")
+def post_image(post, size="feed"):
+    """Картинка публикации с ``srcset`` из готовых уменьшенных копий.
+
+    ``size`` — ``feed`` или ``detail``; в ленте картинка загружается
+    лениво, а в ``src`` попадает копия поменьше.
+    """
+    image = post.image
+    info = post.image_info
+    default_width, sizes = IMAGE_SIZES[size]
+    candidates = {
+        width: image.storage.url(name)
+        for width, name in get_variant_names(image.name, info).items()
+    }
+    # Оригинал не крупнее самой большой копии тоже годится для srcset.
+    if info and info["width"] <= max(IMAGE_VARIANT_WIDTHS):
+        candidates[info["width"]] = image.url
+    fitting = [width for width in candidates if width <= default_width]
+    return {
+        "info": info,
+        "src": candidates[max(fitting)] if fitting else image.url,
+        "srcset": ", ".join(
+            f"{candidates[width]} {width}w" for width in sorted(candidates)
+        ),
+        "sizes": sizes,
+        "lazy": size == "feed",
+    }
@@ -1,14 +1,23 @@
+from django.conf import settings
 from django.urls import path
 
-from blog import views
+from blog import api, async_views, feeds, views
 
 
 app_name = "blog"
 
+# Под ASGI страницы для чтения обходятся без перехода в поток на запрос.
+read_views = (
+    async_views if getattr(settings, "BLOG_ASYNC_VIEWS", False) else views
+)
+
 urlpatterns = [
-    path("", views.index, name="index"),
+    path("", read_views.index, name="index"),
+    path("search/", views.search, name="search"),
     path("posts/create/", views.PostCreateView.as_view(), name="create_post"),
-    path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
+    path(
+        "posts/<int:post_id>/", read_views.post_detail, name="post_detail"
+    ),
     path(
         "posts/<int:post_id>/edit/",
         views.PostUpdateView.as_view(),
@@ -19,6 +28,11 @@ urlpatterns = [
         views.PostDeleteView.as_view(),
         name="delete_post",
     ),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.post_comments,
+        name="post_comments",
+    ),
     path(
         "posts/<int:post_id>/comment/",
         views.CommentCreateView.as_view(),
@@ -36,13 +50,55 @@ urlpatterns = [
     ),
     path(
         "category/<slug:category_slug>/",
-        views.category_posts,
+        read_views.category_posts,
         name="category_posts",
     ),
-    path("profile/<slug:username>/", views.user_profile, name="profile"),
+    path(
+        "category/<slug:category_slug>/rss/",
+        feeds.CategoryFeed(),
+        name="category_rss",
+    ),
+    path(
+        "category/<slug:category_slug>/atom/",
+        feeds.CategoryAtomFeed(),
+        name="category_atom",
+    ),
+    path(
+        "profile/<slug:username>/",
+        read_views.user_profile,
+        name="profile",
+    ),
+    path(
+        "profile/<slug:username>/rss/",
+        feeds.AuthorFeed(),
+        name="profile_rss",
+    ),
+    path(
+        "profile/<slug:username>/atom/",
+        feeds.AuthorAtomFeed(),
+        name="profile_atom",
+    ),
     path(
         "profile/<slug:username>/edit_profile/",
         views.ProfileUpdateView.as_view(),
         name="edit_profile",
     ),
+    path("api/posts/", api.post_list, name="api_posts"),
+    path("api/posts/<int:post_id>/", api.post_detail, name="api_post"),
+    path(
+        "api/posts/<int:post_id>/comments/",
+        api.post_comments,
+        name="api_post_comments",
+    ),
+    path("api/categories/", api.category_list, name="api_categories"),
+    path(
+        "api/profiles/<slug:username>/",
+        api.profile_detail,
+        name="api_profile",
+    ),
+    path(
+        "api/profiles/<slug:username>/posts/",
+        api.profile_posts,
+        name="api_profile_posts",
+    ),
 ]
@@ -1,80 +1,262 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
-from django.core.paginator import Paginator
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.views.generic import CreateView, DeleteView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
-from django.db.models import Count
-from django.http import Http404
-
-from blog.models import Post, Category, Comment
+from django.db.models import Count, Max, Q
+from django.utils.cache import patch_cache_control
+from django.utils.http import urlencode
+from django.views.static import serve
+
+from blog.cache import (
+    cache_feed_page,
+    get_cached_feed_page,
+    get_feed_page_key,
+)
+from blog.conditional import conditional_view, make_etag, set_validators
+from blog.models import Post, Category
 from blog.forms import PostForm, CommentForm
-from blog.constants import MAX_POSTS_PER_PAGE
+from blog.constants import (
+    COMMENT_ORDERING,
+    COMMENTS_PER_PAGE,
+    FEED_COUNT_STRATEGY,
+    FEED_ORDERING,
+    FEED_PAGINATION_CURSOR,
+    FEED_PAGINATION_PAGE,
+    MAX_POSTS_PER_PAGE,
+    MEDIA_IMMUTABLE_MAX_AGE,
+    MEDIA_MAX_AGE,
+)
 from blog.mixins import PostMixin, CommentMixin
+from blog.paginators import (
+    COUNT_STRATEGIES,
+    CursorPaginator,
+    NoCountPaginator,
+)
+from blog.search import search_posts
+from blog.storage import is_immutable
+from core.routers import replica_reads
 
 
 User = get_user_model()
 
 
-def filter_posts(objects):
-    return objects.filter(
+def visible_posts_q(user=None):
+    """Условие видимости публикации; автору видны и его скрытые."""
+    visible = Q(
         is_published=True,
         category__is_published=True,
-        pub_date__lte=timezone.now()
-    ).select_related("author", "location", "category")
+        pub_date__lte=timezone.now(),
+    )
+    if user is not None and user.is_authenticated:
+        visible |= Q(author=user)
+    return visible
+
+
+def filter_posts(objects, user=None):
+    return objects.filter(visible_posts_q(user)).select_related(
+        "author", "location", "category"
+    )
+
+
+def get_feed_validators(request, posts):
+    """Валидаторы ленты по агрегатам её публикаций.
+
+    Число публикаций ловит удаление и снятие с публикации, максимум
+    ``updated_at`` — правки, максимум ``pub_date`` — отложенные
+    публикации, которые стали видны со временем.
+    """
+    stats = posts.order_by().aggregate(
+        total=Count("pk"),
+        last_updated=Max("updated_at"),
+        last_published=Max("pub_date"),
+    )
+    if not stats["total"]:
+        return None
+    etag = make_etag(
+        request,
+        stats["total"],
+        stats["last_updated"].isoformat(),
+        stats["last_published"].isoformat(),
+    )
+    return etag, max(stats["last_updated"], stats["last_published"])
+
+
+def get_page_cache_validators(request, cache_key, context):
+    """Валидаторы страницы из кэша лент — без запросов к базе.
+
+    Страница в кэше не меняется до истечения срока, поэтому ETag
+    привязан к моменту её рендера.
+    """
+    if context is None or "rendered_at" not in context:
+        return None
+    rendered_at = context["rendered_at"]
+    return make_etag(request, cache_key, rendered_at.isoformat()), rendered_at
+
+
+def get_feed_page_validators(request, cache_key, posts):
+    if cache_key is None:
+        return get_feed_validators(request, posts)
+    # При промахе страница всё равно будет отрисована и закэширована,
+    # а валидаторы выставит само представление.
+    return get_page_cache_validators(
+        request, cache_key, get_cached_feed_page(cache_key)
+    )
 
 
-def get_page_obj(items_to_paginate, request):
-    paginator = Paginator(items_to_paginate, MAX_POSTS_PER_PAGE)
+def get_post_validators(request, post_id):
+    updated_at = (
+        Post.objects.filter(visible_posts_q(request.user), pk=post_id)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return make_etag(request, updated_at.isoformat()), updated_at
+
+
+def get_category_validators(request, category_slug):
+    return get_feed_page_validators(
+        request,
+        get_feed_page_key("category", category_slug, request),
+        filter_posts(Post.objects.filter(category__slug=category_slug)),
+    )
+
+
+def get_profile_validators(request, username):
+    is_owner = request.user.username == username
+    posts = Post.objects.filter(author__username=username)
+    if not is_owner:
+        posts = filter_posts(posts)
+    return get_feed_page_validators(
+        request,
+        get_feed_page_key("profile", username, request, is_owner),
+        posts,
+    )
+
+
+def get_page_obj(items_to_paginate, request, feed_key=None):
+    mode = getattr(settings, "BLOG_FEED_PAGINATION", FEED_PAGINATION_PAGE)
+    if mode == FEED_PAGINATION_CURSOR:
+        paginator = CursorPaginator(
+            items_to_paginate, MAX_POSTS_PER_PAGE, ordering=FEED_ORDERING
+        )
+        return paginator.get_page(request.GET.get("cursor"))
+    strategy = getattr(settings, "BLOG_FEED_COUNT", FEED_COUNT_STRATEGY)
+    paginator = COUNT_STRATEGIES[strategy](
+        items_to_paginate.order_by(*FEED_ORDERING),
+        MAX_POSTS_PER_PAGE,
+        feed_key=feed_key,
+    )
     page_number = request.GET.get("page")
     return paginator.get_page(page_number)
 
 
+def get_index_context(request):
+    posts = filter_posts(Post.objects.order_by("-pub_date"))
+    page_obj = get_page_obj(posts, request, feed_key="index")
+    return {"page_obj": page_obj}
+
+
+@replica_reads
 @login_required
 def index(request):
     template = "blog/index.html"
-    posts = filter_posts(
-        Post.objects.annotate(comment_count=Count("comments"))
-            .order_by("-pub_date")
-    )
-    page_obj = get_page_obj(posts, request)
-    context = {"page_obj": page_obj}
+    context = get_index_context(request)
 
     return render(request, template, context)
 
 
+def get_visible_post(request, post_id):
+    return get_object_or_404(
+        filter_posts(Post.objects.all(), request.user), pk=post_id
+    )
+
+
+def get_comments_page(post, request):
+    paginator = CursorPaginator(
+        post.comments.select_related("author"),
+        COMMENTS_PER_PAGE,
+        ordering=COMMENT_ORDERING,
+    )
+    return paginator.get_page(request.GET.get("cursor"))
+
+
+def get_post_detail_context(request, post_id):
+    post = get_visible_post(request, post_id)
+    form = CommentForm()
+    comments = get_comments_page(post, request)
+    return {"post": post, "form": form, "comments": comments}
+
+
+@replica_reads
 @login_required
+@conditional_view(get_post_validators)
 def post_detail(request, post_id):
     template = "blog/detail.html"
-    post = get_object_or_404(Post, pk=post_id)
-    if request.user != post.author and any(
-            (
-                post.pub_date > timezone.now(),
-                not post.is_published,
-                not post.category.is_published,
-            )
-    ):
-        raise Http404
-    form = CommentForm()
-    comments = Comment.objects.filter(post_id=post_id).select_related('post')
-    context = {"post": post, "form": form, "comments": comments}
+    context = get_post_detail_context(request, post_id)
 
     return render(request, template, context)
 
 
+@replica_reads
 @login_required
+def post_comments(request, post_id):
+    template = "includes/comment_list.html"
+    post = get_visible_post(request, post_id)
+    comments = get_comments_page(post, request)
+    context = {"post": post, "comments": comments}
+
+    return render(request, template, context)
+
+
+def get_category_page(request, category_slug):
+    """Контекст страницы категории и валидаторы её копии в кэше."""
+    cache_key = get_feed_page_key("category", category_slug, request)
+    context = get_cached_feed_page(cache_key)
+    if context is None:
+        category = get_object_or_404(
+            Category,
+            slug=category_slug,
+            is_published=True
+        )
+        post_list = filter_posts(category.posts)
+        page_obj = get_page_obj(
+            post_list, request, feed_key=f"category:{category_slug}"
+        )
+        context = {"category": category, "page_obj": page_obj}
+        cache_feed_page(cache_key, context, request)
+    return context, get_page_cache_validators(request, cache_key, context)
+
+
+@replica_reads
+@login_required
+@conditional_view(get_category_validators)
 def category_posts(request, category_slug):
     template = "blog/category.html"
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True
+    context, validators = get_category_page(request, category_slug)
+
+    return set_validators(render(request, template, context), validators)
+
+
+@login_required
+def search(request):
+    template = "blog/search.html"
+    query = request.GET.get("q", "").strip()
+    # Результаты упорядочены по релевантности, поэтому вместо курсора —
+    # номер страницы, а вместо COUNT(*) — выборка на строку больше.
+    paginator = NoCountPaginator(
+        search_posts(filter_posts(Post.objects), query), MAX_POSTS_PER_PAGE
     )
-    post_list = filter_posts(category.posts)
-    page_obj = get_page_obj(post_list, request)
-    context = {"category": category, "page_obj": page_obj}
+    page_obj = paginator.get_page(request.GET.get("page"))
+    context = {
+        "query": query,
+        "page_obj": page_obj,
+        "page_query": f"{urlencode({'q': query})}&",
+    }
 
     return render(request, template, context)
 
@@ -108,8 +290,7 @@ class PostDeleteView(PostMixin, LoginRequiredMixin, DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        instance = get_object_or_404(Post, pk=self.kwargs.get("post_id"))
-        form = PostForm(instance=instance)
+        form = PostForm(instance=self.object)
         context["form"] = form
         return context
 
@@ -138,18 +319,33 @@ class CommentDeleteView(CommentMixin, LoginRequiredMixin, DeleteView):
     pass
 
 
+def get_profile_page(request, username):
+    """Контекст страницы профиля и валидаторы её копии в кэше."""
+    is_owner = request.user.username == username
+    cache_key = get_feed_page_key("profile", username, request, is_owner)
+    context = get_cached_feed_page(cache_key)
+    if context is None:
+        profile = get_object_or_404(User, username=username)
+        posts = profile.posts.select_related(
+            "author", "location", "category"
+        ).order_by("-pub_date")
+        if not is_owner:
+            posts = filter_posts(posts)
+        page_obj = get_page_obj(
+            posts, request, feed_key=f"profile:{username}:{is_owner:d}"
+        )
+        context = {"page_obj": page_obj, "profile": profile}
+        cache_feed_page(cache_key, context, request)
+    return context, get_page_cache_validators(request, cache_key, context)
+
+
+@replica_reads
+@conditional_view(get_profile_validators)
 def user_profile(request, username):
     template = "blog/profile.html"
-    profile = get_object_or_404(User, username=username)
-    posts = profile.posts.annotate(comment_count=Count("comments")).order_by(
-        "-pub_date"
-    )
-    if request.user.username != username:
-        posts = filter_posts(posts)
-    page_obj = get_page_obj(posts, request)
-    context = {"page_obj": page_obj, "profile": profile}
+    context, validators = get_profile_page(request, username)
 
-    return render(request, template, context)
+    return set_validators(render(request, template, context), validators)
 
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
@@ -164,3 +360,18 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return reverse_lazy(
             "blog:profile", kwargs={"username": self.request.user.username}
         )
+
+
+def serve_media(request, path, document_root=None):
+    """Раздаёт загрузки; файлы с хешем в имени кэшируются навсегда."""
+    response = serve(request, path, document_root=document_root)
+    if is_immutable(path):
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=MEDIA_IMMUTABLE_MAX_AGE,
+            immutable=True,
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=MEDIA_MAX_AGE)
+    return response
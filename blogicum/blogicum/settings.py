@@ -33,6 +33,7 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
 INSTALLED_APPS = [
     "blog.apps.BlogConfig",
     "pages.apps.PagesConfig",
+    "core.apps.CoreConfig",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -44,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.QueryBudgetMiddleware",
+    "core.middleware.PrimaryStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,7 +63,7 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.template_backends.TimedDjangoTemplates",
         "DIRS": [TEMPLATES_DIR],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -87,6 +90,19 @@ DATABASES = {
     }
 }
 
+# PRAGMA для каждого нового соединения SQLite (core.signals); настроенный
+# набор — в settings_production.
+SQLITE_PRAGMAS = {}
+
+# Реплики только для чтения — алиасы из DATABASES. Страницы и API для
+# чтения обходят их по кругу, пропуская недоступные (проверка раз в
+# REPLICA_HEALTH_INTERVAL секунд). После записи клиент ещё
+# REPLICA_STICKY_SECONDS секунд читает из основной базы.
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_HEALTH_INTERVAL = 30
+REPLICA_STICKY_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -128,6 +144,10 @@ STATIC_URL = "/static/"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Загрузки хранятся по хешу содержимого: одинаковые файлы не дублируются,
+# а их адреса можно кэшировать навсегда.
+DEFAULT_FILE_STORAGE = "blog.storage.ContentAddressedStorage"
+
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
@@ -146,3 +166,54 @@ LOGIN_REDIRECT_URL = "blog:index"
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 
 EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+
+# Режим пагинации лент: "page" (номера страниц) или "cursor" (keyset).
+BLOG_FEED_PAGINATION = "page"
+
+# Подсчёт записей для постраничной пагинации:
+# "exact", "cached", "estimated" или "has_next".
+BLOG_FEED_COUNT = "exact"
+
+# Алиас из CACHES для кэша блога: версии групп, карточки публикаций,
+# страницы лент и RSS. Кэш должен быть общим для всех воркеров — см.
+# core.cache.SQLiteCache в settings_production.
+BLOG_CACHE_ALIAS = "default"
+
+# Время жизни кэша страниц лент категорий и профилей, 0 — кэш выключен.
+BLOG_FEED_PAGE_CACHE_TIMEOUT = 0
+
+# Где обрабатывать загруженные картинки: "thread" — в пуле потоков
+# процесса после ответа, "worker" — командой process_images,
+# "sync" — прямо в запросе.
+BLOG_IMAGE_PROCESSING = "thread"
+BLOG_IMAGE_PROCESSING_WORKERS = 2
+
+# Асинхронные версии страниц для чтения (включены в settings_asgi) и
+# размер пула потоков, в котором они обращаются к базе; 0 — общий
+# поток sync_to_async.
+BLOG_ASYNC_VIEWS = False
+ASYNC_DB_THREADS = 8
+
+# Бюджеты SQL-запросов на представление; "default" — для остальных.
+QUERY_BUDGETS = {
+    "blog:index": 6,
+    "blog:post_detail": 6,
+    "blog:post_comments": 6,
+    "blog:category_posts": 6,
+    "blog:profile": 6,
+    "blog:search": 6,
+}
+
+# True — превышение бюджета выбрасывает исключение (удобно в тестах).
+QUERY_BUDGET_STRICT = False
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.middleware": {"handlers": ["console"], "level": "INFO"},
+    },
+}
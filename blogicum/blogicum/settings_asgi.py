@@ -0,0 +1,15 @@
+"""Профиль развёртывания под ASGI (uvicorn, daphne, hypercorn)."""
+from blogicum.settings import *  # noqa: F401,F403
+from blogicum.settings import MIDDLEWARE
+
+# Страницы для чтения — асинхронные, запросы к базе выполняются в пуле
+# из ASYNC_DB_THREADS потоков.
+BLOG_ASYNC_VIEWS = True
+ASYNC_DB_THREADS = 8
+
+# Синхронное middleware заставляет Django переходить в поток на каждый
+# запрос, а debug toolbar асинхронно работать не умеет.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith("debug_toolbar.")
+]
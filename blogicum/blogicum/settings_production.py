@@ -0,0 +1,123 @@
+"""Профиль боевого развёртывания (gunicorn с несколькими воркерами).
+
+Всё, что отличается между окружениями, задаётся переменными окружения
+``DJANGO_*``; обязательна только ``DJANGO_SECRET_KEY``.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.settings import *  # noqa: F401,F403
+from blogicum.settings import (
+    BASE_DIR,
+    DATABASES,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+    TEMPLATES,
+)
+
+
+def env(name, default=None):
+    value = os.environ.get(name, default)
+    if value is None:
+        raise ImproperlyConfigured(f"Не задана переменная окружения {name}.")
+    return value
+
+
+def env_bool(name, default=False):
+    return env(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name, default=""):
+    return [item.strip() for item in env(name, default).split(",")
+            if item.strip()]
+
+
+SECRET_KEY = env("DJANGO_SECRET_KEY")
+DEBUG = env_bool("DJANGO_DEBUG")
+ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1")
+
+# Debug toolbar и его middleware в бою не нужны.
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith("debug_toolbar.")
+]
+
+# Шаблоны компилируются один раз на процесс: кэширующий загрузчик
+# явно, независимо от DEBUG, и без контекстного процессора отладки.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            "debug": False,
+            "context_processors": [
+                processor
+                for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if processor != "django.template.context_processors.debug"
+            ],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+DATABASES = {
+    **DATABASES,
+    "default": {
+        **DATABASES["default"],
+        "NAME": env("DJANGO_DB_PATH", str(BASE_DIR / "db.sqlite3")),
+        # Соединение живёт между запросами: PRAGMA и открытие файла —
+        # один раз на поток воркера, а не на каждый запрос.
+        "CONN_MAX_AGE": int(env("DJANGO_CONN_MAX_AGE", "600")),
+    },
+}
+
+# WAL: читатели не ждут писателя и наоборот, а synchronous=NORMAL в
+# этом режиме не теряет целостность, только последние транзакции при
+# сбое питания. mmap и кэш страниц уменьшают число системных вызовов
+# при чтении; busy_timeout — сколько писатель ждёт блокировку, прежде
+# чем получить «database is locked».
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    # Отрицательное значение — в КиБ: 64 МиБ.
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,
+    "temp_store": "memory",
+}
+
+# Общий для всех воркеров кэш: версии групп кэша, карточки публикаций,
+# страницы и RSS-ленты должны совпадать во всех процессах, иначе
+# сброс версии в одном воркере не виден остальным. По умолчанию — файл
+# SQLite на этом сервере (core.cache); для нескольких серверов задайте
+# DJANGO_CACHE_BACKEND, например, с memcached.
+CACHES = {
+    "default": {
+        "BACKEND": env("DJANGO_CACHE_BACKEND", "core.cache.SQLiteCache"),
+        "LOCATION": env(
+            "DJANGO_CACHE_LOCATION", str(BASE_DIR / "cache" / "cache.sqlite3")
+        ),
+        "TIMEOUT": int(env("DJANGO_CACHE_TIMEOUT", "600")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(env("DJANGO_CACHE_MAX_ENTRIES", "50000")),
+        },
+    }
+}
+BLOG_FEED_PAGE_CACHE_TIMEOUT = int(
+    env("DJANGO_FEED_PAGE_CACHE_TIMEOUT", "60")
+)
+
+STATIC_ROOT = env("DJANGO_STATIC_ROOT", str(BASE_DIR / "static_root"))
+MEDIA_ROOT = env("DJANGO_MEDIA_ROOT", str(BASE_DIR / "media"))
+
+SESSION_COOKIE_SECURE = CSRF_COOKIE_SECURE = env_bool("DJANGO_HTTPS")
@@ -20,6 +20,8 @@ from django.views.generic.edit import CreateView
 from django.conf.urls.static import static
 from django.conf import settings
 
+from blog.views import serve_media
+
 
 urlpatterns = [
     path("", include("blog.urls", namespace="blog")),
@@ -43,7 +45,9 @@ if settings.DEBUG:
 
     urlpatterns += (path("__debug__/", include(debug_toolbar.urls)),)
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += static(
+    settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT
+)
 
 handler404 = "core.views.page_not_found"
 handler500 = "core.views.internal_server_error"
@@ -0,0 +1,308 @@
+"""Кэш в файле SQLite, общий для всех воркеров на одном сервере.
+
+``LocMemCache`` у каждого процесса свой: воркеры gunicorn дублируют
+записи, а смена версии группы кэша в одном воркере не видна другим.
+``SQLiteCache`` хранит записи в одном файле (``LOCATION``) в режиме WAL:
+читатели не блокируют друг друга и писателя.
+
+При превышении ``MAX_ENTRIES`` вытесняются давно не читавшиеся записи
+(LRU). ``COUNT(*)`` под блокировкой записи дорог, поэтому размер
+проверяется раз в ``CULL_INTERVAL`` записей процесса: между проверками
+кэш может ненадолго превысить предел. Чтобы чтение не превращалось в
+запись, время доступа обновляется не чаще раза в ``TOUCH_INTERVAL``
+секунд на ключ. Счётчики попаданий,
+промахов и вытеснений копятся в процессе и раз в ``STATS_INTERVAL``
+секунд прибавляются к общим в том же файле; ``stats()`` отдаёт сумму
+по всем процессам.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+from contextlib import contextmanager
+from time import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+TOUCH_INTERVAL = 1.0
+STATS_INTERVAL = 5.0
+CULL_INTERVAL = 100
+# Не больше стольких ключей в одном IN (...): у SQLite есть предел
+# числа параметров запроса.
+KEYS_PER_QUERY = 500
+BUSY_TIMEOUT = 5.0
+COUNTERS = ("hits", "misses", "evictions")
+
+SCHEMA = (
+    "PRAGMA journal_mode = wal",
+    "PRAGMA synchronous = normal",
+    "CREATE TABLE IF NOT EXISTS cache ("
+    " key TEXT PRIMARY KEY,"
+    " value BLOB NOT NULL,"
+    " expires REAL,"
+    " accessed REAL NOT NULL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)",
+    "CREATE TABLE IF NOT EXISTS cache_stats ("
+    " name TEXT PRIMARY KEY,"
+    " value INTEGER NOT NULL"
+    ")",
+)
+LIVE = "(expires IS NULL OR expires > ?)"
+
+
+def chunked(keys):
+    for start in range(0, len(keys), KEYS_PER_QUERY):
+        yield keys[start:start + KEYS_PER_QUERY]
+
+
+def placeholders(keys):
+    return ", ".join("?" * len(keys))
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._path = os.path.abspath(location)
+        self._touch_interval = float(
+            options.get("TOUCH_INTERVAL", TOUCH_INTERVAL)
+        )
+        self._stats_interval = float(
+            options.get("STATS_INTERVAL", STATS_INTERVAL)
+        )
+        self._cull_interval = int(
+            options.get("CULL_INTERVAL", CULL_INTERVAL)
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._flushed_at = time()
+        self._writes = 0
+
+    @property
+    def _connection(self):
+        # Соединение своё у каждого потока и каждого процесса: после
+        # fork унаследованным соединением пользоваться нельзя.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            connection = sqlite3.connect(
+                self._path, timeout=BUSY_TIMEOUT, isolation_level=None
+            )
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _write(self):
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+            due = time() - self._flushed_at >= self._stats_interval
+        if due:
+            self._flush_stats()
+
+    def _flush_stats(self):
+        with self._lock:
+            counters = self._counters
+            self._counters = dict.fromkeys(COUNTERS, 0)
+            self._flushed_at = time()
+        counters = {name: value for name, value in counters.items() if value}
+        if not counters:
+            return
+        with self._write() as connection:
+            connection.executemany(
+                "INSERT INTO cache_stats (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE "
+                "SET value = value + excluded.value",
+                counters.items(),
+            )
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _touch_stale(self, keys, now):
+        """Отмечает чтение ключей, давно не отмеченных (для LRU)."""
+        stale = [key for key, accessed in keys if
+                 now - accessed >= self._touch_interval]
+        if stale:
+            self._connection.executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ?",
+                [(now, key) for key in stale],
+            )
+
+    def _cull_due(self):
+        """Первая и каждая ``CULL_INTERVAL``-я запись процесса."""
+        with self._lock:
+            due = self._writes % self._cull_interval == 0
+            self._writes += 1
+        return due
+
+    def _cull(self, connection, now):
+        """Освобождает место; возвращает число вытесненных записей."""
+        if not self._cull_due():
+            return 0
+        count = connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count <= self._max_entries:
+            return 0
+        count -= connection.execute(
+            "DELETE FROM cache WHERE expires <= ?", (now,)
+        ).rowcount
+        if count <= self._max_entries:
+            return 0
+        if self._cull_frequency == 0:
+            excess = count
+        else:
+            excess = (
+                count - self._max_entries
+                + self._max_entries // self._cull_frequency
+            )
+        return connection.execute(
+            "DELETE FROM cache WHERE key IN ("
+            " SELECT key FROM cache ORDER BY accessed, key LIMIT ?"
+            ")",
+            (excess,),
+        ).rowcount
+
+    def _store(self, connection, key, value, timeout, now):
+        connection.execute(
+            "INSERT INTO cache (key, value, expires, accessed) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+            "expires = excluded.expires, accessed = excluded.accessed",
+            (
+                key,
+                pickle.dumps(value, self.pickle_protocol),
+                self.get_backend_timeout(timeout),
+                now,
+            ),
+        )
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self._key(key, version): key for key in keys}
+        if not keys:
+            return {}
+        now = time()
+        rows = []
+        for chunk in chunked(list(keys)):
+            rows += self._connection.execute(
+                f"SELECT key, value, accessed FROM cache "
+                f"WHERE key IN ({placeholders(chunk)}) AND {LIVE}",
+                (*chunk, now),
+            ).fetchall()
+        self._touch_stale([(key, accessed) for key, _, accessed in rows], now)
+        self._count(hits=len(rows), misses=len(keys) - len(rows))
+        return {keys[key]: pickle.loads(value) for key, value, _ in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time()
+        with self._write() as connection:
+            for key, value in data.items():
+                self._store(
+                    connection, self._key(key, version), value, timeout, now
+                )
+            evicted = self._cull(connection, now)
+        self._count(evictions=evicted)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        now = time()
+        with self._write() as connection:
+            exists = connection.execute(
+                f"SELECT 1 FROM cache WHERE key = ? AND {LIVE}", (key, now)
+            ).fetchone()
+            if exists:
+                return False
+            self._store(connection, key, value, timeout, now)
+            evicted = self._cull(connection, now)
+        self._count(evictions=evicted)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time()
+        with self._write() as connection:
+            return bool(connection.execute(
+                f"UPDATE cache SET expires = ?, accessed = ? "
+                f"WHERE key = ? AND {LIVE}",
+                (
+                    self.get_backend_timeout(timeout),
+                    now,
+                    self._key(key, version),
+                    now,
+                ),
+            ).rowcount)
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        now = time()
+        with self._write() as connection:
+            row = connection.execute(
+                f"SELECT value FROM cache WHERE key = ? AND {LIVE}",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            connection.execute(
+                "UPDATE cache SET value = ?, accessed = ? WHERE key = ?",
+                (pickle.dumps(value, self.pickle_protocol), now, key),
+            )
+        return value
+
+    def has_key(self, key, version=None):
+        return self._connection.execute(
+            f"SELECT 1 FROM cache WHERE key = ? AND {LIVE}",
+            (self._key(key, version), time()),
+        ).fetchone() is not None
+
+    def delete(self, key, version=None):
+        return bool(self._connection.execute(
+            "DELETE FROM cache WHERE key = ?", (self._key(key, version),)
+        ).rowcount)
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        for chunk in chunked(keys):
+            self._connection.execute(
+                f"DELETE FROM cache WHERE key IN ({placeholders(chunk)})",
+                chunk,
+            )
+
+    def clear(self):
+        self._connection.execute("DELETE FROM cache")
+
+    def stats(self):
+        """Счётчики всех процессов, число записей и предел."""
+        self._flush_stats()
+        connection = self._connection
+        stats = dict.fromkeys(COUNTERS, 0)
+        stats.update(connection.execute("SELECT name, value FROM cache_stats"))
+        stats["entries"] = connection.execute(
+            "SELECT COUNT(*) FROM cache"
+        ).fetchone()[0]
+        stats["max_entries"] = self._max_entries
+        return stats
@@ -0,0 +1,67 @@
+"""Доступ к базе из асинхронного кода.
+
+ORM в Django 3.2 синхронный, поэтому асинхронные представления отдают
+работу с базой в отдельный пул потоков ограниченного размера
+(``ASYNC_DB_THREADS``). Каждый поток держит своё соединение, так что
+пул заодно ограничивает число соединений с базой. При
+``ASYNC_DB_THREADS = 0`` используется ``sync_to_async`` — общий поток
+Django, в котором видны и транзакции тестов.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from core.middleware import current_metrics, track_queries
+
+ASYNC_DB_THREADS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings, "ASYNC_DB_THREADS", ASYNC_DB_THREADS
+                ),
+                thread_name_prefix="async-db",
+            )
+        return _executor
+
+
+def call_with_metrics(func, *args, **kwargs):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return func(*args, **kwargs)
+    with track_queries(metrics):
+        return func(*args, **kwargs)
+
+
+def call_in_pool(func, *args, **kwargs):
+    # Как между запросами: закрыть соединения, пережившие CONN_MAX_AGE
+    # или сломанные.
+    close_old_connections()
+    try:
+        return call_with_metrics(func, *args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_db(func, *args, **kwargs):
+    """Выполняет синхронную ``func`` с доступом к базе вне event loop."""
+    if not getattr(settings, "ASYNC_DB_THREADS", ASYNC_DB_THREADS):
+        return await sync_to_async(call_with_metrics)(func, *args, **kwargs)
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_db_executor(),
+        partial(context.run, call_in_pool, func, *args, **kwargs),
+    )
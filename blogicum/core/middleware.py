@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter, time
+
+from django.conf import settings
+from django.db import connections
+
+from core.routers import (
+    REPLICA_STICKY_COOKIE,
+    REPLICA_STICKY_SECONDS,
+    get_replicas,
+    routing_state,
+)
+
+logger = logging.getLogger(__name__)
+
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """Счётчики одного запроса: SQL-запросы и время рендера шаблонов."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += perf_counter() - started
+
+
+@contextmanager
+def track_queries(metrics):
+    """Считает в ``metrics`` запросы соединений текущего потока."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            if metrics not in connection.execute_wrappers:
+                stack.enter_context(connection.execute_wrapper(metrics))
+        yield
+
+
+class QueryBudgetMiddleware:
+    """Замеряет запросы к БД и рендер шаблонов для каждого запроса.
+
+    Отдаёт замеры в заголовке ``Server-Timing`` и в лог, а при
+    превышении ``QUERY_BUDGETS`` для представления пишет предупреждение
+    или, если ``QUERY_BUDGET_STRICT``, выбрасывает ``QueryBudgetExceeded``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django узнаёт, что middleware можно вызывать без
+            # перехода в поток.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = perf_counter()
+        try:
+            with track_queries(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.report(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        # Запросы асинхронных представлений идут из потоков пула БД,
+        # которые сами подключают ``metrics`` через ``current_metrics``.
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.report(request, response, metrics, started)
+
+    def report(self, request, response, metrics, started):
+        total_time = perf_counter() - started
+
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        response["Server-Timing"] = ", ".join((
+            f'db;dur={metrics.sql_time * 1000:.2f};'
+            f'desc="{metrics.queries} queries"',
+            f"tpl;dur={metrics.template_time * 1000:.2f}",
+            f"total;dur={total_time * 1000:.2f}",
+        ))
+        logger.info(
+            "view=%s method=%s status=%s queries=%d sql_ms=%.2f "
+            "template_ms=%.2f total_ms=%.2f",
+            view_name,
+            request.method,
+            response.status_code,
+            metrics.queries,
+            metrics.sql_time * 1000,
+            metrics.template_time * 1000,
+            total_time * 1000,
+            extra={
+                "view": view_name,
+                "method": request.method,
+                "status": response.status_code,
+                "queries": metrics.queries,
+                "sql_ms": metrics.sql_time * 1000,
+                "template_ms": metrics.template_time * 1000,
+                "total_ms": total_time * 1000,
+            },
+        )
+        self.check_budget(view_name, metrics.queries)
+        return response
+
+    def check_budget(self, view_name, queries):
+        budgets = getattr(settings, "QUERY_BUDGETS", {})
+        budget = budgets.get(view_name, budgets.get("default"))
+        if budget is None or queries <= budget:
+            return
+        message = (
+            f"{view_name} выполнил {queries} SQL-запросов "
+            f"при бюджете {budget}"
+        )
+        if getattr(settings, "QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class PrimaryStickinessMiddleware:
+    """Читать из основной базы, пока реплики могут не знать о записи.
+
+    Если запрос что-то записал, ответ ставит cookie со сроком
+    ``REPLICA_STICKY_SECONDS``; пока он не истёк, ``replica_reads`` для
+    этого клиента читает основную базу. Без ``DATABASE_REPLICAS``
+    middleware ничего не делает.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not get_replicas():
+            return self.get_response(request)
+        with routing_state(self.is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.stick(response, state)
+
+    async def __acall__(self, request):
+        if not get_replicas():
+            return await self.get_response(request)
+        with routing_state(self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.stick(response, state)
+
+    def is_pinned(self, request):
+        try:
+            until = float(request.COOKIES.get(REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time()
+
+    def stick(self, response, state):
+        if state.wrote:
+            seconds = getattr(
+                settings, "REPLICA_STICKY_SECONDS", REPLICA_STICKY_SECONDS
+            )
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE,
+                f"{time() + seconds:.0f}",
+                max_age=seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
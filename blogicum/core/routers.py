@@ -0,0 +1,180 @@
+"""Чтение с реплик базы данных.
+
+Реплики — алиасы из ``DATABASES``, перечисленные в ``DATABASE_REPLICAS``.
+Запись всегда идёт в основную базу, чтение — тоже, кроме представлений,
+помеченных ``replica_reads``: их запросы распределяются между репликами
+по кругу. Реплика, не прошедшая проверку, пропускается до следующей
+проверки через ``REPLICA_HEALTH_INTERVAL`` секунд; если живых реплик
+нет, читается основная база.
+
+Реплики отстают от основной базы, поэтому запрос, который что-то
+записал, и запросы того же клиента в течение ``REPLICA_STICKY_SECONDS``
+секунд после него читают из основной базы — это отмечает cookie из
+``PrimaryStickinessMiddleware``. По той же причине то, что прочитано с
+реплики, не записывается в общий кэш (см. ``served_from_replica``):
+иначе отставшая страница легла бы под ключ с уже новой версией и
+досталась бы и автору изменения.
+"""
+import asyncio
+import itertools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import monotonic
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_STICKY_SECONDS = 10
+REPLICA_HEALTH_INTERVAL = 30
+REPLICA_STICKY_COOKIE = "db_primary"
+# Реплика без схемы (например, только что созданный пустой файл SQLite)
+# тоже не считается живой.
+HEALTH_CHECK_SQL = "SELECT 1 FROM django_migrations LIMIT 1"
+# Сессии меняются при входе и выходе и читаются каждым запросом: отставшая
+# реплика разлогинила бы пользователя.
+PRIMARY_ONLY_APPS = {"sessions"}
+
+current_routing = ContextVar("current_routing", default=None)
+
+
+class RoutingState:
+    """Куда читать в текущем запросе и была ли в нём запись."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica_reads = False
+        self.wrote = False
+        self.replica_used = False
+
+    @property
+    def use_replicas(self):
+        return self.replica_reads and not (self.pinned or self.wrote)
+
+
+def get_replicas():
+    return tuple(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+@contextmanager
+def routing_state(pinned=False):
+    state = RoutingState(pinned)
+    token = current_routing.set(state)
+    try:
+        yield state
+    finally:
+        current_routing.reset(token)
+
+
+@contextmanager
+def reading_replicas():
+    state = current_routing.get()
+    token = None
+    if state is None:
+        # Вне PrimaryStickinessMiddleware: команды, тесты.
+        state = RoutingState()
+        token = current_routing.set(state)
+    previous = state.replica_reads
+    state.replica_reads = True
+    try:
+        yield state
+    finally:
+        state.replica_reads = previous
+        if token is not None:
+            current_routing.reset(token)
+
+
+def served_from_replica():
+    """Читал ли текущий запрос что-либо с реплики."""
+    state = current_routing.get()
+    return state is not None and state.replica_used
+
+
+def replica_reads(view):
+    """Отправляет чтение представления на реплики."""
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with reading_replicas():
+                return await view(request, *args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with reading_replicas():
+            return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def check_replica(alias):
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(HEALTH_CHECK_SQL)
+            cursor.fetchone()
+    except DatabaseError:
+        logger.warning("Реплика %s недоступна", alias, exc_info=True)
+        return False
+    return True
+
+
+class ReplicaRouter:
+    """Роутер: реплики по кругу для ``replica_reads``, запись — в основную."""
+
+    def __init__(self):
+        self.counter = itertools.count()
+        self.checks = {}
+
+    def is_healthy(self, alias):
+        interval = getattr(
+            settings, "REPLICA_HEALTH_INTERVAL", REPLICA_HEALTH_INTERVAL
+        )
+        checked = self.checks.get(alias)
+        if checked is not None and monotonic() - checked[0] < interval:
+            return checked[1]
+        healthy = check_replica(alias)
+        self.checks[alias] = (monotonic(), healthy)
+        return healthy
+
+    def get_replica(self):
+        replicas = get_replicas()
+        for _ in replicas:
+            alias = replicas[next(self.counter) % len(replicas)]
+            if self.is_healthy(alias):
+                return alias
+        return None
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Связанные объекты читаются оттуда же, откуда сам объект.
+            return instance._state.db
+        state = current_routing.get()
+        if (
+            state is None
+            or not state.use_replicas
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+        ):
+            return DEFAULT_DB_ALIAS
+        alias = self.get_replica()
+        if alias is None:
+            return DEFAULT_DB_ALIAS
+        state.replica_used = True
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной базы, объекты из них можно связывать.
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
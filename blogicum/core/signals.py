@@ -0,0 +1,23 @@
+"""Настройка соединений SQLite через PRAGMA из ``SQLITE_PRAGMAS``.
+
+Django 3.2 не умеет передавать PRAGMA в ``OPTIONS``, поэтому они
+выполняются при каждом новом соединении. При ``CONN_MAX_AGE > 0`` это
+случается редко: соединение переживает запросы.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(connection, pragmas):
+    # Напрямую через драйвер: PRAGMA не должны попадать в счётчики
+    # SQL-запросов представлений.
+    for name, value in pragmas.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", None)
+    if connection.vendor == "sqlite" and pragmas:
+        apply_pragmas(connection, pragmas)
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            location=None,
+            is_published=True,
+            pub_date=now - timedelta(hours=number),
+        )
+        for number in range(1, 6)
+    ]
+
+
+@pytest.fixture
+def hidden_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+def test_post_list_uses_sparse_fields(user_client, posts, hidden_post):
+    response = user_client.get("/api/posts/?fields=id,title,author")
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data["results"] == [
+        {"id": post.pk, "title": post.title, "author": post.author.username}
+        for post in posts
+    ]
+    assert data["next"] is None
+
+
+def test_post_list_cursor_pagination(user_client, posts):
+    seen = []
+    url = "/api/posts/?fields=id&limit=2"
+    while url:
+        data = user_client.get(url).json()
+        seen += [row["id"] for row in data["results"]]
+        url = data["next"]
+    assert seen == [post.pk for post in posts]
+
+
+def test_unknown_field_is_rejected(user_client, posts):
+    response = user_client.get("/api/posts/?fields=title,password")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "password" in response.json()["detail"]
+
+
+def test_anonymous_gets_unauthorized(client, posts):
+    response = client.get("/api/posts/")
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_post_detail_respects_visibility(
+    user_client, another_user_client, hidden_post
+):
+    url = f"/api/posts/{hidden_post.pk}/?fields=title"
+    assert user_client.get(url).json() == {"title": hidden_post.title}
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_post_comments(user_client, mixer, user, posts):
+    post = posts[0]
+    comments = mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    data = user_client.get(f"/api/posts/{post.pk}/comments/").json()
+    assert [row["id"] for row in data["results"]] == [
+        comment.pk for comment in comments
+    ]
+    assert data["results"][0]["author"] == user.username
+
+
+def test_categories_and_profile(
+    user_client, client, mixer, user, published_category, posts, hidden_post
+):
+    mixer.blend("blog.Category", is_published=False)
+    data = user_client.get("/api/categories/?fields=slug").json()
+    assert data["results"] == [{"slug": published_category.slug}]
+
+    profile = client.get(f"/api/profiles/{user.username}/").json()
+    assert profile["username"] == user.username
+    assert "is_staff" not in profile
+    public = client.get(f"/api/profiles/{user.username}/posts/?fields=id")
+    owner = user_client.get(f"/api/profiles/{user.username}/posts/?fields=id")
+    assert len(public.json()["results"]) == len(posts)
+    assert len(owner.json()["results"]) == len(posts) + 1
+
+
+def test_post_list_is_one_query(user_client, posts):
+    user_client.get("/api/posts/")
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get("/api/posts/")
+    assert len(
+        [query for query in queries if "blog_post" in query["sql"]]
+    ) == 1
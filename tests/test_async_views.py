@@ -0,0 +1,133 @@
+import importlib
+import json
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.urls import clear_url_caches
+from django.utils import timezone
+
+import blog.urls
+import blogicum.urls
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def async_views(settings):
+    settings.BLOG_ASYNC_VIEWS = True
+    settings.ASYNC_DB_THREADS = 0
+    importlib.reload(blog.urls)
+    importlib.reload(blogicum.urls)
+    clear_url_caches()
+    yield
+    settings.BLOG_ASYNC_VIEWS = False
+    importlib.reload(blog.urls)
+    importlib.reload(blogicum.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def client_of(async_client, user, async_views):
+    async_client.force_login(user)
+    return async_client
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def get(client, url, **extra):
+    return async_to_sync(client.get)(url, **extra)
+
+
+def test_views_are_async(async_views):
+    match = blog.urls.urlpatterns[0]
+    assert match.callback.__module__ == "blog.async_views"
+
+
+@pytest.mark.parametrize("page", ["index", "detail", "category", "profile"])
+def test_async_pages_render(
+    client_of, user, published_category, visible_post, page
+):
+    url = {
+        "index": "/",
+        "detail": f"/posts/{visible_post.pk}/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[page]
+    response = get(client_of, url)
+    assert response.status_code == HTTPStatus.OK
+    assert visible_post.title in response.content.decode()
+    queries = int(
+        re.search(r'desc="(\d+) queries"', response["Server-Timing"])[1]
+    )
+    assert queries > 0
+
+
+def test_async_detail_answers_not_modified(client_of, visible_post):
+    url = f"/posts/{visible_post.pk}/"
+    response = get(client_of, url)
+    # AsyncClient передаёт заголовки под их HTTP-именами.
+    cached = get(client_of, url, **{"If-None-Match": response["ETag"]})
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_async_index_redirects_anonymous(async_client, async_views):
+    response = get(async_client, "/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert "/auth/login/" in response["Location"]
+
+
+def test_async_hidden_post_is_not_found(
+    async_client, another_user, async_views, visible_post
+):
+    visible_post.is_published = False
+    visible_post.save()
+    async_client.force_login(another_user)
+    response = get(async_client, f"/posts/{visible_post.pk}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_thread_pool(client_of, settings, visible_post):
+    settings.ASYNC_DB_THREADS = 2
+    response = get(client_of, f"/posts/{visible_post.pk}/")
+    assert response.status_code == HTTPStatus.OK
+    assert visible_post.title in response.content.decode()
+    # Запросы в потоках пула видны метрикам запроса: contextvars
+    # копируются в поток вместе с задачей.
+    queries = int(
+        re.search(r'desc="(\d+) queries"', response["Server-Timing"])[1]
+    )
+    assert queries > 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("interface", ["wsgi", "asgi"])
+def test_benchmark_concurrency(tmp_path, async_views, interface):
+    call_command(
+        "seed_blog", "--users=2", "--categories=1", "--locations=1",
+        "--posts=5", "--comments=5", "--workers=1", verbosity=0,
+    )
+    report_path = tmp_path / "report.json"
+    call_command(
+        "benchmark_concurrency", f"--interface={interface}",
+        "--concurrency=1,4", "--requests=4", "--scenario=post_detail",
+        f"--output={report_path}",
+    )
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert set(report["results"]) == {"post_detail@1", "post_detail@4"}
+    for stats in report["results"].values():
+        assert stats["rps"] > 0
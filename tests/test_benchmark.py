@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_benchmark_views_writes_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    call_command(
+        "benchmark_views",
+        "--seed",
+        "--users=5",
+        "--categories=2",
+        "--locations=2",
+        "--posts=30",
+        "--comments=60",
+        "--repeat=2",
+        f"--output={report_path}",
+    )
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+
+    assert report["meta"]["rows"]["posts"] == Post.objects.count()
+    assert {"index", "post_detail", "category_posts", "user_profile",
+            "add_comment", "edit_comment", "delete_comment"} <= set(
+        report["results"]
+    )
+    for stats in report["results"].values():
+        assert stats["runs"] == 2
+        assert stats["median_ms"] > 0
+    assert sum(Post.objects.values_list("comment_count", flat=True)) == (
+        Comment.objects.count()
+    )
+
+
+def test_benchmark_views_compares_with_baseline(tmp_path):
+    call_command(
+        "benchmark_views", "--seed", "--users=3", "--categories=1",
+        "--locations=1", "--posts=5", "--comments=5", "--repeat=1",
+        "--scenario=index", f"--output={tmp_path / 'old.json'}",
+    )
+    call_command(
+        "benchmark_views", "--repeat=1", "--scenario=index",
+        f"--baseline={tmp_path / 'old.json'}",
+        f"--output={tmp_path / 'new.json'}",
+    )
+    report = json.loads((tmp_path / "new.json").read_text(encoding="utf-8"))
+    assert set(report["change_pct"]) == {"index"}
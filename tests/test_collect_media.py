@@ -0,0 +1,140 @@
+import os
+import time
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import variant_name
+from blog.management.commands.collect_media import Command
+from blog.models import StoredFile
+from blog.storage import ContentAddressedStorage
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    settings.BLOG_IMAGE_PROCESSING = "sync"
+    return tmp_path / "media"
+
+
+def make_old(path, content=b"orphan"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    old = time.time() - 2 * 60 * 60
+    os.utime(path, (old, old))
+    return path
+
+
+@pytest.fixture
+def post_with_image(mixer, user):
+    buffer = BytesIO()
+    Image.effect_noise((1000, 800), 64).convert("RGB").save(
+        buffer, format="JPEG"
+    )
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        image=ImageFile(buffer, name="photo.jpg"),
+    )
+    post.refresh_from_db()
+    return post
+
+
+@pytest.fixture
+def orphans(media_root):
+    stored = make_old(media_root / "images" / "ab" / ("ab" * 32 + ".jpg"))
+    StoredFile.objects.create(
+        name=stored.relative_to(media_root).as_posix(), references=0
+    )
+    return [
+        stored,
+        make_old(media_root / "posts_images" / "old.jpg"),
+        make_old(media_root / "posts_images" / "old.640w.webp"),
+    ]
+
+
+def test_dry_run_reports_without_deleting(post_with_image, orphans):
+    call_command("collect_media", "--dry-run", verbosity=0)
+    assert all(path.exists() for path in orphans)
+    assert StoredFile.objects.count() == 2
+
+
+def test_orphans_are_deleted(post_with_image, orphans, media_root):
+    young = media_root / "posts_images" / "uploading.jpg"
+    young.write_bytes(b"young")
+    call_command("collect_media", "--batch-size=2", verbosity=0)
+    assert not any(path.exists() for path in orphans)
+    assert young.exists()
+    assert (media_root / post_with_image.image.name).exists()
+    assert (
+        media_root / variant_name(post_with_image.image.name, 640)
+    ).exists()
+    assert list(StoredFile.objects.values_list("name", flat=True)) == [
+        post_with_image.image.name
+    ]
+
+
+def test_reuploaded_orphan_survives(media_root):
+    storage = ContentAddressedStorage()
+    name = storage.save("orphan.bin", ContentFile(b"orphan"))
+    StoredFile.objects.filter(name=name).delete()
+    make_old(media_root / name)
+    # Та же картинка загружена снова, публикация ещё не сохранена.
+    assert storage.save("again.bin", ContentFile(b"orphan")) == name
+    call_command("collect_media", verbosity=0)
+    assert (media_root / name).exists()
+    # Живая учётная запись защищает файл и без свежего mtime.
+    make_old(media_root / name)
+    call_command("collect_media", verbosity=0)
+    assert (media_root / name).exists()
+    assert StoredFile.objects.get(name=name).references == 1
+
+
+def test_orphans_are_quarantined(orphans, media_root, tmp_path):
+    quarantine = tmp_path / "quarantine"
+    call_command(
+        "collect_media", f"--quarantine={quarantine}", verbosity=0
+    )
+    for path in orphans:
+        assert not path.exists()
+        assert (quarantine / path.relative_to(media_root)).exists()
+
+
+def test_reference_counts_are_fixed(post_with_image):
+    StoredFile.objects.filter(name=post_with_image.image.name).update(
+        references=5
+    )
+    call_command("collect_media", verbosity=0)
+    assert StoredFile.objects.get(
+        name=post_with_image.image.name
+    ).references == 1
+
+
+def test_reference_fix_sees_uploads_during_scan(
+    post_with_image, mixer, user, media_root, monkeypatch
+):
+    name = post_with_image.image.name
+    StoredFile.objects.filter(name=name).update(references=5)
+    count_references = Command.count_references
+
+    def count_then_upload(self, batch_size):
+        references = count_references(self, batch_size)
+        # Пока идёт обход, та же картинка прикреплена ко второй публикации.
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            image=ImageFile(
+                BytesIO((media_root / name).read_bytes()), name="copy.jpg"
+            ),
+        )
+        return references
+
+    monkeypatch.setattr(Command, "count_references", count_then_upload)
+    call_command("collect_media", verbosity=0)
+    assert StoredFile.objects.get(name=name).references == 2
@@ -0,0 +1,28 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.update(comment_count=0)
+
+    call_command("recount_comments", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2
@@ -0,0 +1,41 @@
+import pytest
+
+from blog.constants import COMMENTS_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_detail_shows_first_batch_and_load_more(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comment", post=post
+    )
+
+    response = user_client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert [comment.id for comment in page] == [
+        comment.id for comment in comments[:COMMENTS_PER_PAGE]
+    ]
+    more_url = f"/posts/{post.id}/comments/?cursor={page.next_cursor}"
+    assert more_url in response.content.decode()
+
+    response = user_client.get(more_url)
+    assert response.status_code == 200
+    rest = response.context["comments"]
+    assert [comment.id for comment in rest] == [
+        comment.id for comment in comments[COMMENTS_PER_PAGE:]
+    ]
+    assert not rest.has_next()
+    assert "<html" not in response.content.decode()
+
+
+def test_load_more_hides_unpublished_post(
+    mixer, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+def test_post_detail_answers_not_modified(user_client, visible_post):
+    url = f"/posts/{visible_post.pk}/"
+    response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("Last-Modified")
+    assert "no-cache" in response["Cache-Control"]
+
+    cached = revalidate(user_client, url, response)
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert not cached.content
+
+
+def test_comment_changes_post_detail_etag(
+    user_client, mixer, user, visible_post
+):
+    url = f"/posts/{visible_post.pk}/"
+    response = user_client.get(url)
+    comment = mixer.blend("blog.Comment", post=visible_post, author=user)
+    commented = revalidate(user_client, url, response)
+    assert commented.status_code == HTTPStatus.OK
+
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    assert revalidate(
+        user_client, url, commented
+    ).status_code == HTTPStatus.OK
+
+
+def test_etag_depends_on_user(
+    user_client, another_user_client, visible_post
+):
+    url = f"/posts/{visible_post.pk}/"
+    response = user_client.get(url)
+    assert revalidate(
+        another_user_client, url, response
+    ).status_code == HTTPStatus.OK
+
+
+def test_etag_depends_on_csrf_token(user_client, visible_post):
+    url = f"/posts/{visible_post.pk}/"
+    response = user_client.get(url)
+    assert revalidate(
+        user_client, url, response
+    ).status_code == HTTPStatus.NOT_MODIFIED
+    # Повторный вход меняет CSRF-токен: нужна страница с новыми формами.
+    user_client.cookies[settings.CSRF_COOKIE_NAME] = "a" * 64
+    assert revalidate(
+        user_client, url, response
+    ).status_code == HTTPStatus.OK
+
+
+def test_hidden_post_is_not_revalidated(
+    user_client, another_user_client, visible_post
+):
+    url = f"/posts/{visible_post.pk}/"
+    response = another_user_client.get(url)
+    visible_post.is_published = False
+    visible_post.save()
+    assert revalidate(
+        another_user_client, url, response
+    ).status_code == HTTPStatus.NOT_FOUND
+    assert user_client.get(url).status_code == HTTPStatus.OK
+
+
+def test_category_feed_answers_not_modified(
+    user_client, mixer, user, published_category, visible_post
+):
+    url = f"/category/{published_category.slug}/"
+    response = user_client.get(url)
+    assert revalidate(
+        user_client, url, response
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    assert revalidate(user_client, url, response).status_code == (
+        HTTPStatus.OK
+    )
+
+
+def test_profile_revalidates_after_category_change(
+    client, user, published_category, visible_post
+):
+    url = f"/profile/{user.username}/"
+    response = client.get(url)
+    assert revalidate(
+        client, url, response
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+    published_category.title = "Новое название"
+    published_category.save()
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK
+
+
+@override_settings(BLOG_FEED_PAGE_CACHE_TIMEOUT=60)
+def test_cached_feed_revalidates_without_blog_queries(
+    user_client, published_category, visible_post
+):
+    url = f"/category/{published_category.slug}/"
+    response = user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        cached = revalidate(user_client, url, response)
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert not [
+        query for query in queries if "blog_" in query["sql"]
+    ]
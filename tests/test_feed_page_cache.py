@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("enable_feed_page_cache"),
+]
+
+
+@pytest.fixture
+def enable_feed_page_cache():
+    with override_settings(BLOG_FEED_PAGE_CACHE_TIMEOUT=60):
+        yield
+
+
+def blog_queries(queries):
+    return [query for query in queries if "blog_" in query["sql"]]
+
+
+def test_repeat_category_hit_skips_blog_queries(
+    mixer, user, user_client, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    url = f"/category/{published_category.slug}/"
+    assert post.title in user_client.get(url).content.decode()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert post.title in response.content.decode()
+    assert not blog_queries(queries)
+
+    new_post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    assert new_post.title in user_client.get(url).content.decode()
+
+
+def test_profile_cache_varies_on_owner(
+    mixer, user, user_client, another_user_client, published_category
+):
+    hidden = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+    )
+    url = f"/profile/{user.username}/"
+    assert hidden.title in user_client.get(url).content.decode()
+    assert hidden.title not in another_user_client.get(url).content.decode()
+    assert hidden.title in user_client.get(url).content.decode()
+
+
+def test_moving_post_invalidates_previous_category(
+    mixer, user, user_client, published_category, another_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    url = f"/category/{published_category.slug}/"
+    assert post.title in user_client.get(url).content.decode()
+
+    post.category = another_category
+    post.save()
+    assert post.title not in user_client.get(url).content.decode()
@@ -0,0 +1,127 @@
+import os
+import time
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
+from PIL import Image
+
+from blog.images import variant_name
+from blog.models import Post, StoredFile
+from blog.storage import ContentAddressedStorage, is_immutable
+from blog.views import serve_media
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_IMAGE_PROCESSING = "sync"
+    return tmp_path
+
+
+def make_image(size=(1000, 800), name="photo.jpg"):
+    buffer = BytesIO()
+    Image.effect_noise(size, 64).convert("RGB").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def blend_post(mixer, user, data, name="photo.jpg"):
+    return mixer.blend(
+        "blog.Post", author=user, image=ImageFile(BytesIO(data), name=name)
+    )
+
+
+def test_identical_uploads_share_one_file(mixer, user, media_root):
+    data = make_image()
+    first = blend_post(mixer, user, data, "first.JPG")
+    second = blend_post(mixer, user, data, "second.jpg")
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.image.name == second.image.name
+    assert is_immutable(first.image.name)
+    assert first.image.name.endswith(".jpg")
+    stored = StoredFile.objects.get(name=first.image.name)
+    assert stored.references == 2
+    assert stored.size == len(data)
+    originals = [
+        path for path in media_root.rglob("*.jpg") if path.is_file()
+    ]
+    assert len(originals) == 1
+
+
+def test_file_is_deleted_with_last_reference(mixer, user, media_root):
+    data = make_image()
+    first = blend_post(mixer, user, data)
+    second = blend_post(mixer, user, data)
+    second.refresh_from_db()
+    name = second.image.name
+    variant = media_root / variant_name(name, 640)
+    assert variant.exists()
+
+    first.delete()
+    assert (media_root / name).exists()
+    assert variant.exists()
+    assert StoredFile.objects.get(name=name).references == 1
+
+    second.delete()
+    assert not (media_root / name).exists()
+    assert not variant.exists()
+    assert not StoredFile.objects.filter(name=name).exists()
+
+
+def test_rewritten_original_is_saved_under_new_name(mixer, user, media_root):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    Image.effect_noise((1000, 800), 64).convert("RGB").save(
+        buffer, format="JPEG", exif=exif.tobytes()
+    )
+    post = blend_post(mixer, user, buffer.getvalue())
+    post.refresh_from_db()
+    assert post.image_status == Post.ImageStatus.READY
+    # Исходный файл с метаданными удалён, осталась только очищенная копия.
+    assert list(StoredFile.objects.values_list("name", "references")) == [
+        (post.image.name, 1)
+    ]
+    originals = [
+        path for path in media_root.rglob("*.jpg") if path.is_file()
+    ]
+    assert [path.relative_to(media_root).as_posix() for path in originals] == [
+        post.image.name
+    ]
+
+
+def test_streamed_upload_is_hashed_in_chunks(settings, media_root):
+    settings.MEDIA_ROOT = media_root
+    storage = ContentAddressedStorage()
+    data = b"x" * (300 * 1024)
+    name = storage.save("big.bin", ContentFile(data))
+    assert (media_root / name).read_bytes() == data
+    assert storage.save("copy.bin", ContentFile(data)) == name
+    assert not any((media_root / ".incoming").iterdir())
+    assert StoredFile.objects.get(name=name).references == 2
+
+
+def test_duplicate_upload_refreshes_mtime(media_root):
+    storage = ContentAddressedStorage()
+    name = storage.save("old.bin", ContentFile(b"same"))
+    old = time.time() - 24 * 60 * 60
+    os.utime(media_root / name, (old, old))
+    assert storage.save("new.bin", ContentFile(b"same")) == name
+    assert (media_root / name).stat().st_mtime > old + 60
+
+
+def test_hashed_media_is_cached_forever(rf, mixer, user, media_root):
+    post = blend_post(mixer, user, make_image((300, 200)))
+    (media_root / "legacy.jpg").write_bytes(b"legacy")
+    hashed = serve_media(
+        rf.get("/"), post.image.name, document_root=media_root
+    )
+    legacy = serve_media(rf.get("/"), "legacy.jpg", document_root=media_root)
+    assert hashed["Cache-Control"] == (
+        "public, max-age=31536000, immutable"
+    )
+    assert legacy["Cache-Control"] == "public, max-age=86400"
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.paginators import (
+    CachedCountPaginator,
+    CursorPaginator,
+    NoCountPaginator,
+)
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    now = timezone.now()
+    # Одинаковые даты попарно: порядок обязан добираться по pk.
+    pub_dates = (
+        now - timedelta(hours=index // 2) for index in range(N_PER_PAGE * 3)
+    )
+    return mixer.cycle(N_PER_PAGE * 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+def test_cursor_paginator_walks_feed_forward_and_back(many_posts):
+    expected = list(
+        Post.objects.order_by("-pub_date", "-pk").values_list("pk", flat=True)
+    )
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+
+    seen = []
+    pages = []
+    page = paginator.get_page()
+    assert not page.has_previous()
+    while True:
+        pages.append(page)
+        seen.extend(post.pk for post in page)
+        if not page.has_next():
+            break
+        page = paginator.get_page(page.next_cursor)
+    assert seen == expected
+
+    back = paginator.get_page(pages[-1].previous_cursor)
+    assert [post.pk for post in back] == [post.pk for post in pages[-2]]
+    assert back.has_next()
+
+
+def test_cursor_paginator_ignores_garbage_cursor(many_posts):
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    page = paginator.get_page("not-a-cursor")
+    assert not page.has_previous()
+    assert len(page) == N_PER_PAGE
+
+
+@override_settings(BLOG_FEED_PAGINATION="cursor")
+def test_feed_uses_cursor_links(many_posts, user_client):
+    response = user_client.get("/")
+    page_obj = response.context["page_obj"]
+    assert page_obj.is_cursor_page
+    assert f"?cursor={page_obj.next_cursor}" in response.content.decode()
+
+    response = user_client.get(f"/?cursor={page_obj.next_cursor}")
+    second = response.context["page_obj"]
+    assert second.has_previous()
+    assert not set(second).intersection(page_obj)
+
+
+def test_has_next_paginator_skips_count(many_posts):
+    paginator = NoCountPaginator(Post.objects.all(), N_PER_PAGE)
+    with CaptureQueriesContext(connection) as queries:
+        page = paginator.get_page(2)
+        assert len(page) == N_PER_PAGE
+        assert page.has_next()
+        assert page.has_previous()
+        assert page.start_index() == N_PER_PAGE + 1
+        assert page.end_index() == 2 * N_PER_PAGE
+    assert len(queries) == 1
+    assert "COUNT(" not in queries[0]["sql"].upper()
+    assert not paginator.get_page(3).has_next()
+
+
+def test_cached_count_is_invalidated_on_post_save(
+    many_posts, mixer, user, published_category
+):
+    def count():
+        return CachedCountPaginator(
+            Post.objects.all(), N_PER_PAGE, feed_key="test"
+        ).count
+
+    assert count() == len(many_posts)
+    with CaptureQueriesContext(connection) as queries:
+        assert count() == len(many_posts)
+    assert not queries
+
+    mixer.blend("blog.Post", author=user, category=published_category)
+    assert count() == len(many_posts) + 1
+
+
+@override_settings(BLOG_FEED_COUNT="has_next")
+def test_feed_with_has_next_strategy(many_posts, user_client):
+    response = user_client.get("/?page=2")
+    page_obj = response.context["page_obj"]
+    assert page_obj.is_uncounted
+    assert "?page=3" in response.content.decode()
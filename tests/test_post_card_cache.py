@@ -0,0 +1,34 @@
+import pytest
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_is_served_from_cache_until_post_changes(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in user_client.get("/").content.decode()
+
+    Post.objects.filter(pk=post.pk).update(title="Заголовок без сигнала")
+    assert post.title in user_client.get("/").content.decode()
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in user_client.get("/").content.decode()
+
+
+def test_post_card_follows_comments_and_category(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in user_client.get("/").content.decode()
+
+    post.category.title = "Переименованная категория"
+    post.category.save()
+    content = user_client.get("/").content.decode()
+    assert "Переименованная категория" in content
@@ -0,0 +1,218 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import variant_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_IMAGE_PROCESSING = "sync"
+    return tmp_path
+
+
+def make_image(size=(2400, 1600), name="photo.jpg", mode="RGB", exif=None):
+    buffer = BytesIO()
+    image = Image.effect_noise(size, 64).convert(mode)
+    if mode == "RGBA":
+        image.putalpha(128)
+    options = {"exif": exif} if exif is not None else {}
+    image.save(
+        buffer, format="PNG" if name.endswith(".png") else "JPEG", **options
+    )
+    return ImageFile(buffer, name=name)
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        location=None,
+        image=make_image(),
+    )
+
+
+def test_variants_are_generated_on_upload(
+    post_with_large_image, media_root
+):
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    assert post.image_status == Post.ImageStatus.READY
+    assert post.image_info == {
+        "width": 2400,
+        "height": 1600,
+        "format": "webp",
+        "variants": [320, 640, 960, 1280],
+    }
+    original_size = (media_root / post.image.name).stat().st_size
+    for width in post.image_info["variants"]:
+        path = media_root / variant_name(post.image.name, width)
+        with Image.open(path) as variant:
+            assert variant.size == (width, round(width * 2 / 3))
+            assert variant.format == "WEBP"
+    feed_variant = media_root / variant_name(post.image.name, 640)
+    assert feed_variant.stat().st_size * 10 < original_size
+
+
+def test_small_image_has_no_variants(mixer, user, media_root):
+    post = mixer.blend("blog.Post", author=user, image=make_image((300, 200)))
+    post.refresh_from_db()
+    assert post.image_info["variants"] == []
+    files = [
+        path.relative_to(media_root).as_posix()
+        for path in media_root.rglob("*")
+        if path.is_file()
+    ]
+    assert files == [post.image.name]
+
+
+def test_transparency_is_kept(mixer, user, media_root):
+    post = mixer.blend(
+        "blog.Post", author=user,
+        image=make_image((800, 800), name="logo.png", mode="RGBA"),
+    )
+    with Image.open(media_root / variant_name(post.image.name, 640)) as image:
+        assert image.mode == "RGBA"
+
+
+def test_original_is_rotated_and_stripped(mixer, user, media_root):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: повернуть на 90° по часовой.
+    exif[0x010F] = "Camera"
+    post = mixer.blend(
+        "blog.Post", author=user,
+        image=make_image((3000, 1000), exif=exif.tobytes()),
+    )
+    post.refresh_from_db()
+    with Image.open(media_root / post.image.name) as original:
+        assert original.size == (853, 2560)
+        assert not original.getexif()
+    assert post.image_info["width"] == 853
+    assert post.image_info["variants"] == [320, 640]
+
+
+def test_phone_mpo_is_rotated_and_stripped(mixer, user, media_root):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif.get_ifd(0x8825)[2] = (55.0, 45.0, 0.0)  # GPSLatitude
+    frames = [
+        Image.effect_noise((1200, 800), 64).convert("RGB") for _ in range(2)
+    ]
+    buffer = BytesIO()
+    frames[0].save(
+        buffer, format="MPO", save_all=True, append_images=frames[1:],
+        exif=exif,
+    )
+    with Image.open(BytesIO(buffer.getvalue())) as uploaded:
+        assert uploaded.format == "MPO"
+    post = mixer.blend(
+        "blog.Post", author=user, image=ImageFile(buffer, name="phone.jpg")
+    )
+    post.refresh_from_db()
+    with Image.open(media_root / post.image.name) as original:
+        assert original.format == "JPEG"
+        assert original.size == (800, 1200)
+        assert not original.getexif()
+    assert (post.image_info["width"], post.image_info["height"]) == (
+        800, 1200
+    )
+    with Image.open(media_root / variant_name(post.image.name, 640)) as image:
+        assert image.size == (640, 960)
+
+
+def test_broken_image_is_marked_failed(mixer, user, media_root):
+    post = mixer.blend("blog.Post", author=user, image=make_image())
+    (media_root / post.image.name).write_bytes(b"not an image")
+    Post.objects.filter(pk=post.pk).update(
+        image_status=Post.ImageStatus.PROCESSING
+    )
+    call_command("process_images", "--workers=1", verbosity=0)
+    post.refresh_from_db()
+    assert post.image_status == Post.ImageStatus.FAILED
+
+
+def test_feed_and_detail_use_srcset(user_client, post_with_large_image):
+    post = post_with_large_image
+
+    def url(width):
+        return post.image.storage.url(variant_name(post.image.name, width))
+
+    content = user_client.get("/").content.decode()
+    assert f'src="{url(640)}"' in content
+    assert f"{url(1280)} 1280w" in content
+    assert 'width="2400" height="1600"' in content
+    assert 'loading="lazy"' in content
+    assert f'href="{post.image.url}"' in content
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert f'src="{url(1280)}"' in content
+
+
+def test_replacing_image_removes_old_variants(
+    post_with_large_image, media_root
+):
+    post = post_with_large_image
+    old_variant = media_root / variant_name(post.image.name, 320)
+    assert old_variant.exists()
+    post.image = make_image((1000, 500), name="other.jpg")
+    post.save()
+    post.refresh_from_db()
+    assert not old_variant.exists()
+    assert post.image_info["variants"] == [320, 640, 960]
+
+    post.delete()
+    assert not (media_root / variant_name(post.image.name, 320)).exists()
+
+
+def test_worker_mode_queues_image(
+    settings, user_client, mixer, user, published_category, media_root
+):
+    settings.BLOG_IMAGE_PROCESSING = "worker"
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, image=make_image(),
+    )
+    post.refresh_from_db()
+    assert post.image_status == Post.ImageStatus.PROCESSING
+    assert post.image_info == {}
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert f'src="{post.image.url}"' in content
+    assert "srcset" not in content
+
+    call_command("process_images", "--workers=1", verbosity=0)
+    post.refresh_from_db()
+    assert post.image_status == Post.ImageStatus.READY
+    assert (media_root / variant_name(post.image.name, 640)).exists()
+
+
+def test_thread_mode_waits_for_commit(
+    settings, mixer, user, django_capture_on_commit_callbacks
+):
+    settings.BLOG_IMAGE_PROCESSING = "thread"
+    with django_capture_on_commit_callbacks() as callbacks:
+        post = mixer.blend("blog.Post", author=user, image=make_image())
+    assert len(callbacks) == 1
+    post.refresh_from_db()
+    assert post.image_status == Post.ImageStatus.PROCESSING
+
+
+def test_requeue_replaces_legacy_variants(post_with_large_image, media_root):
+    post = post_with_large_image
+    legacy = media_root / variant_name(post.image.name, 320, "jpg")
+    legacy.write_bytes(b"old")
+    Post.objects.filter(pk=post.pk).update(
+        image_info={"width": 2400, "height": 1600, "variants": [320]}
+    )
+    call_command("process_images", "--requeue", "--workers=1", verbosity=0)
+    post.refresh_from_db()
+    assert post.image_info["format"] == "webp"
+    assert not legacy.exists()
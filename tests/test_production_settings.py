@@ -0,0 +1,61 @@
+import importlib
+import json
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+
+def load_production_settings():
+    module = importlib.import_module("blogicum.settings_production")
+    return importlib.reload(module)
+
+
+def test_production_settings_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "production-secret")
+    monkeypatch.setenv("DJANGO_ALLOWED_HOSTS", "blog.example, www.example")
+    monkeypatch.setenv("DJANGO_DB_PATH", str(tmp_path / "db.sqlite3"))
+    monkeypatch.setenv("DJANGO_CACHE_LOCATION", str(tmp_path / "cache"))
+    production = load_production_settings()
+
+    assert production.DEBUG is False
+    assert production.SECRET_KEY == "production-secret"
+    assert production.ALLOWED_HOSTS == ["blog.example", "www.example"]
+    assert "debug_toolbar" not in production.INSTALLED_APPS
+    assert not any("debug_toolbar" in item for item in production.MIDDLEWARE)
+    options = production.TEMPLATES[0]["OPTIONS"]
+    assert options["loaders"][0][0] == "django.template.loaders.cached.Loader"
+    assert production.TEMPLATES[0]["APP_DIRS"] is False
+    assert production.CACHES["default"]["LOCATION"] == str(tmp_path / "cache")
+    assert production.DATABASES["default"]["NAME"] == str(
+        tmp_path / "db.sqlite3"
+    )
+    assert production.BLOG_FEED_PAGE_CACHE_TIMEOUT > 0
+
+
+def test_production_settings_require_secret_key(monkeypatch):
+    monkeypatch.delenv("DJANGO_SECRET_KEY", raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        load_production_settings()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_startup(tmp_path):
+    call_command(
+        "seed_blog", "--users=2", "--categories=1", "--locations=1",
+        "--posts=5", "--comments=5", "--workers=1", verbosity=0,
+    )
+    report_path = tmp_path / "report.json"
+    call_command(
+        "benchmark_startup", "--requests=2", f"--output={report_path}"
+    )
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert set(report["results"]) == {
+        "blogicum.settings", "blogicum.settings_production"
+    }
+    for stats in report["results"].values():
+        assert stats["startup_s"] > 0
+        assert stats["rss_peak_mb"] >= stats["rss_startup_mb"]
+        assert set(stats["pages"]) == {
+            "index", "post_detail", "category_posts", "user_profile"
+        }
@@ -0,0 +1,31 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+from core.middleware import QueryBudgetExceeded
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_server_timing_header(user_client, post_with_published_location):
+    response = user_client.get("/")
+    timing = response["Server-Timing"]
+    queries = int(re.search(r'desc="(\d+) queries"', timing).group(1))
+    assert queries > 0
+    template_ms = float(re.search(r"tpl;dur=([\d.]+)", timing).group(1))
+    assert template_ms > 0
+
+
+@override_settings(QUERY_BUDGETS={"blog:index": 1}, QUERY_BUDGET_STRICT=True)
+def test_strict_budget_fails_request(user_client):
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get("/")
+
+
+@override_settings(QUERY_BUDGETS={"default": 1})
+def test_budget_warning_is_logged(user_client, caplog):
+    with caplog.at_level("WARNING", logger="core.middleware"):
+        response = user_client.get("/")
+    assert response.status_code == 200
+    assert any("blog:index" in record.message for record in caplog.records)
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_post_detail_queries_do_not_grow_with_comments(
+    mixer, user_client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    mixer.blend("blog.Comment", post=post)
+    baseline = count_queries(user_client, url)
+
+    mixer.cycle(5).blend("blog.Comment", post=post, author=another_user)
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    assert count_queries(user_client, url) == baseline
+
+
+def post_lookups(queries):
+    return [
+        query for query in queries
+        if query["sql"].startswith('SELECT "blog_post"."id"')
+    ]
+
+
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_edit_and_delete_fetch_post_once(
+    user_client, post_with_published_location, action
+):
+    url = f"/posts/{post_with_published_location.id}/{action}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert len(post_lookups(queries)) == 1
+
+
+def test_comment_edit_fetches_comment_once(
+    mixer, user, user_client, post_with_published_location
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    url = f"/posts/{comment.post_id}/edit_comment/{comment.id}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert len([
+        query for query in queries
+        if query["sql"].startswith('SELECT "blog_comment"."id"')
+    ]) == 1
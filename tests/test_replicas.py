@@ -0,0 +1,141 @@
+import sqlite3
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connections, router
+from django.utils import timezone
+
+from blog.models import Post
+from core.routers import REPLICA_STICKY_COOKIE, reading_replicas
+
+# Копия базы снимается с закоммиченных данных.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def replicas(tmp_path, settings):
+    """Реплики — файлы SQLite, скопированные с основной базы.
+
+    ``sync()`` копирует основную базу заново, как догнавшая репликация.
+    """
+    aliases = []
+
+    def add(alias, name=None):
+        connections.settings[alias] = {
+            **connections.settings["default"],
+            "NAME": str(name or tmp_path / f"{alias}.sqlite3"),
+        }
+        aliases.append(alias)
+        settings.DATABASE_REPLICAS = list(aliases)
+        # Новый экземпляр роутера — без прошлых проверок реплик.
+        settings.DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+        if name is None:
+            sync()
+
+    def sync():
+        primary = connections["default"]
+        primary.ensure_connection()
+        for alias in aliases:
+            connections[alias].close()
+            target = sqlite3.connect(connections.settings[alias]["NAME"])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+
+    add.sync = sync
+    yield add
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+def create_post(mixer, author, category, title):
+    return mixer.blend(
+        "blog.Post",
+        title=title,
+        author=author,
+        category=category,
+        location=None,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_reads_go_to_replica_round_robin(replicas):
+    replicas("replica")
+    replicas("replica2")
+    with reading_replicas():
+        aliases = [router.db_for_read(Post) for _ in range(4)]
+        assert router.db_for_write(Post) == "default"
+    assert aliases == ["replica", "replica2", "replica", "replica2"]
+    assert router.db_for_read(Post) == "default"
+
+
+def test_read_views_use_replica(
+    mixer, user, user_client, published_category, replicas
+):
+    create_post(mixer, user, published_category, "Replicated post")
+    replicas("replica")
+    create_post(mixer, user, published_category, "Fresh post")
+
+    for url in ("/", f"/profile/{user.username}/", "/api/posts/"):
+        content = user_client.get(url).content.decode()
+        assert "Replicated post" in content
+        assert "Fresh post" not in content
+
+    replicas.sync()
+    assert "Fresh post" in user_client.get("/").content.decode()
+
+
+def test_writer_reads_own_writes(
+    mixer, user, user_client, another_user_client, published_category,
+    replicas,
+):
+    post = create_post(mixer, user, published_category, "Публикация")
+    replicas("replica")
+    url = f"/posts/{post.pk}/"
+
+    response = user_client.post(f"{url}comment/", {"text": "Свежий ответ"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert REPLICA_STICKY_COOKIE in response.cookies
+
+    assert "Свежий ответ" in user_client.get(url).content.decode()
+    assert "Свежий ответ" not in (
+        another_user_client.get(url).content.decode()
+    )
+
+
+def test_unhealthy_replica_is_skipped(
+    mixer, user, user_client, published_category, replicas, tmp_path
+):
+    replicas("replica", tmp_path / "missing" / "replica.sqlite3")
+    create_post(mixer, user, published_category, "Только в основной")
+
+    response = user_client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    assert "Только в основной" in response.content.decode()
+    with reading_replicas():
+        assert router.db_for_read(Post) == "default"
+
+
+@pytest.mark.parametrize("page", ["category", "profile"])
+def test_lagging_replica_is_not_cached(
+    page, mixer, user, another_user_client, published_category, replicas,
+    settings,
+):
+    settings.BLOG_FEED_PAGE_CACHE_TIMEOUT = 60
+    create_post(mixer, user, published_category, "Replicated post")
+    replicas("replica")
+    # Версия ленты уже сменилась, а реплика ещё не догнала основную базу.
+    create_post(mixer, user, published_category, "Fresh post")
+    url = (
+        f"/category/{published_category.slug}/" if page == "category"
+        else f"/profile/{user.username}/"
+    )
+    assert "Fresh post" not in another_user_client.get(url).content.decode()
+
+    replicas.sync()
+    assert "Fresh post" in another_user_client.get(url).content.decode()
@@ -0,0 +1,98 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        title="Горное озеро",
+        text="Прогулка вдоль берега на закате",
+        author=user,
+        category=published_category,
+        is_published=True,
+        location=None,
+    )
+
+
+def found_ids(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_finds_post_by_title_and_text(user_client, searchable_post):
+    assert found_ids(user_client, "озеро") == [searchable_post.id]
+    assert found_ids(user_client, "берега закат") == [searchable_post.id]
+    assert found_ids(user_client, "пустыня") == []
+
+
+def test_search_ignores_operators_in_query(user_client, searchable_post):
+    assert found_ids(user_client, '"озеро" (берега* -') == [
+        searchable_post.id
+    ]
+    assert found_ids(user_client, "!!!") == []
+    assert found_ids(user_client, "озеро OR пустыня") == []
+
+
+def test_search_index_follows_post_changes(user_client, searchable_post):
+    searchable_post.title = "Лесная тропа"
+    searchable_post.save()
+    assert found_ids(user_client, "озеро") == []
+    assert found_ids(user_client, "тропа") == [searchable_post.id]
+
+    post_id = searchable_post.id
+    searchable_post.delete()
+    assert found_ids(user_client, "тропа") == []
+    assert not Post.objects.filter(pk=post_id).exists()
+
+
+def test_search_respects_visibility(user_client, searchable_post):
+    searchable_post.is_published = False
+    searchable_post.save()
+    assert found_ids(user_client, "озеро") == []
+
+
+def test_search_ranks_title_matches_first(
+    mixer, user_client, searchable_post, published_category
+):
+    text_match = mixer.blend(
+        "blog.Post",
+        title="Заметки",
+        text="По дороге видели озеро и горы",
+        category=published_category,
+        is_published=True,
+        location=None,
+    )
+    assert found_ids(user_client, "озеро") == [
+        searchable_post.id, text_match.id
+    ]
+
+
+def test_search_paginates_with_query(
+    mixer, user_client, published_category
+):
+    mixer.cycle(12).blend(
+        "blog.Post",
+        title="Озеро",
+        category=published_category,
+        is_published=True,
+        location=None,
+    )
+    response = user_client.get("/search/", {"q": "озеро"})
+    assert len(response.context["page_obj"]) == 10
+    assert "?q=%D0%BE%D0%B7%D0%B5%D1%80%D0%BE&amp;page=2" in (
+        response.content.decode()
+    )
+    assert len(found_ids(user_client, "озеро", page=2)) == 2
+
+
+def test_rebuild_search_index(user_client, searchable_post):
+    Post.objects.filter(pk=searchable_post.pk).update(title="Ручей")
+    assert found_ids(user_client, "ручей") == []
+    call_command("rebuild_search_index", verbosity=0)
+    assert found_ids(user_client, "ручей") == [searchable_post.id]
@@ -0,0 +1,83 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+User = get_user_model()
+
+
+def test_seed_blog_creates_requested_rows(django_user_model):
+    users_before = django_user_model.objects.count()
+    call_command(
+        "seed_blog", "--users=4", "--categories=2", "--locations=3",
+        "--posts=25", "--comments=40", "--batch-size=7", "--workers=1",
+        verbosity=0,
+    )
+    assert django_user_model.objects.count() - users_before == 4
+    assert Category.objects.count() == 2
+    assert Location.objects.count() == 3
+    assert Post.objects.count() == 25
+    assert Comment.objects.count() == 40
+    for post in Post.objects.all():
+        assert post.comment_count == post.comments.count()
+
+
+def test_seed_blog_can_run_twice():
+    options = ("--users=2", "--categories=1", "--locations=1",
+               "--posts=3", "--comments=3", "--workers=1")
+    call_command("seed_blog", *options, verbosity=0)
+    call_command("seed_blog", *options, verbosity=0)
+    assert Category.objects.count() == 2
+    assert Post.objects.count() == 6
+
+
+def test_seed_blog_rejects_posts_without_categories():
+    with pytest.raises(CommandError):
+        call_command(
+            "seed_blog", "--categories=0", "--posts=1", verbosity=0
+        )
+
+
+def seeded_rows(workers):
+    call_command("flush", interactive=False, verbosity=0)
+    call_command(
+        "seed_blog", "--users=5", "--categories=3", "--locations=2",
+        "--posts=20", "--comments=30", "--batch-size=4",
+        f"--workers={workers}", verbosity=0,
+    )
+    # id зависят от sqlite_sequence, время публикации — от момента
+    # запуска, поэтому сравниваются значения и ссылки по ним.
+    return {
+        "users": list(
+            User.objects.order_by("pk").values_list(
+                "username", "first_name", "last_name", "email"
+            )
+        ),
+        "categories": list(
+            Category.objects.order_by("pk").values_list(
+                "slug", "title", "is_published"
+            )
+        ),
+        "posts": list(
+            Post.objects.order_by("pk").values_list(
+                "title", "text", "author__username", "category__slug",
+                "location__name", "is_published",
+            )
+        ),
+        "comments": list(
+            Comment.objects.order_by("pk").values_list(
+                "text", "post__title", "author__username"
+            )
+        ),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_seeded_rows_do_not_depend_on_worker_count():
+    sequential = seeded_rows(1)
+    assert len(sequential["posts"]) == 20
+    assert seeded_rows(2) == sequential
@@ -0,0 +1,137 @@
+import json
+import multiprocessing
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.cache import SQLiteCache
+
+
+def make_cache(path, **options):
+    options = {
+        "TOUCH_INTERVAL": 0, "STATS_INTERVAL": 0, "CULL_INTERVAL": 1,
+        **options,
+    }
+    return SQLiteCache(str(path), {"OPTIONS": options})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return make_cache(tmp_path / "cache.sqlite3")
+
+
+def test_basic_operations(cache):
+    assert cache.get("missing", "default") == "default"
+    cache.set("key", {"value": [1, 2]})
+    assert cache.get("key") == {"value": [1, 2]}
+    assert cache.add("key", "other") is False
+    assert cache.add("new", 1) is True
+    assert cache.incr("new", 5) == 6
+    assert cache.get_many(["key", "new", "missing"]) == {
+        "key": {"value": [1, 2]}, "new": 6,
+    }
+    assert cache.delete("key") is True
+    assert cache.has_key("key") is False
+    cache.set("expired", 1, timeout=0)
+    assert cache.get("expired") is None
+    assert cache.add("expired", 2) is True
+    cache.set("forever", 1, timeout=None)
+    assert cache.touch("forever", 60) is True
+    cache.clear()
+    assert cache.get("forever") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(
+        tmp_path / "cache.sqlite3", MAX_ENTRIES=3, CULL_FREQUENCY=100
+    )
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    assert cache.get("a") == 1
+    cache.set("d", 4)
+
+    assert cache.get_many(["a", "b", "c", "d"]) == {"a": 1, "c": 3, "d": 4}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_is_checked_every_cull_interval_writes(tmp_path):
+    cache = make_cache(
+        tmp_path / "cache.sqlite3", MAX_ENTRIES=2, CULL_FREQUENCY=100,
+        CULL_INTERVAL=3,
+    )
+    for key in "abc":
+        cache.set(key, key)
+    assert cache.stats()["entries"] == 3
+    cache.set("d", "d")
+    assert cache.stats()["entries"] == 2
+
+
+def test_many_keys_are_read_in_chunks(tmp_path):
+    cache = make_cache(tmp_path / "cache.sqlite3", MAX_ENTRIES=2000)
+    data = {f"key{number}": number for number in range(1200)}
+    cache.set_many(data)
+    assert cache.get_many([*data, "missing"]) == data
+    cache.delete_many(data)
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_and_counters_are_shared(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first, second = make_cache(path), make_cache(path)
+    assert first.get("key") is None
+    second.set("key", "value")
+    assert first.get("key") == "value"
+
+    stats = second.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def write_in_child(path):
+    make_cache(path).set("from_child", "value")
+
+
+def test_entries_are_shared_between_processes(tmp_path, cache):
+    path = tmp_path / "cache.sqlite3"
+    assert cache.get("from_child") is None
+    process = multiprocessing.get_context("fork").Process(
+        target=write_in_child, args=(path,)
+    )
+    process.start()
+    process.join()
+    assert cache.get("from_child") == "value"
+
+
+@pytest.mark.django_db
+def test_blog_pages_use_shared_cache(
+    settings, tmp_path, user_client, published_category
+):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "core.cache.SQLiteCache",
+            "LOCATION": str(tmp_path / "blog.sqlite3"),
+            "OPTIONS": {"STATS_INTERVAL": 0},
+        }
+    }
+    settings.BLOG_FEED_PAGE_CACHE_TIMEOUT = 60
+    url = f"/category/{published_category.slug}/"
+    user_client.get(url)
+    user_client.get(url)
+
+    output = StringIO()
+    call_command("cache_stats", stdout=output)
+    stats = json.loads(output.getvalue())
+    assert stats["hits"] > 0
+    assert stats["entries"] > 0
+
+
+def test_cache_stats_needs_counting_backend(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        }
+    }
+    with pytest.raises(CommandError):
+        call_command("cache_stats")
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+
+from core.signals import apply_pragmas
+
+PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+}
+
+
+@pytest.mark.django_db
+def test_pragmas_are_applied_on_connect(tmp_path, settings):
+    settings.SQLITE_PRAGMAS = PRAGMAS
+    primary = connections["default"]
+    database = type(primary)(
+        {**primary.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        "tuned",
+    )
+    try:
+        with database.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
+            cursor.execute("PRAGMA busy_timeout")
+            assert cursor.fetchone()[0] == 5000
+    finally:
+        database.close()
+
+
+@pytest.mark.django_db
+def test_apply_pragmas_skips_query_counters(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        apply_pragmas(connection, {"cache_size": -2000})
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_sqlite(tmp_path, settings):
+    settings.SQLITE_PRAGMAS = PRAGMAS
+    call_command(
+        "seed_blog", "--users=2", "--categories=1", "--locations=1",
+        "--posts=5", "--comments=5", "--workers=1", verbosity=0,
+    )
+    report_path = tmp_path / "report.json"
+    call_command(
+        "benchmark_sqlite", "--readers=2", "--writers=1",
+        "--duration=0.5", f"--output={report_path}",
+    )
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert set(report["results"]) == {"baseline", "tuned"}
+    for roles in report["results"].values():
+        assert roles["read"]["ops"] > 0
+        assert roles["write"]["ops"] > 0
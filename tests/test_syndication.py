@@ -0,0 +1,117 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.parametrize(
+    "suffix, content_type",
+    [("rss", "application/rss+xml"), ("atom", "application/atom+xml")],
+)
+def test_category_feed_lists_visible_posts(
+    client, mixer, user, published_category, visible_post, suffix,
+    content_type,
+):
+    hidden = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    response = client.get(f"/category/{published_category.slug}/{suffix}/")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith(content_type)
+    content = response.content.decode()
+    assert visible_post.title in content
+    assert hidden.title not in content
+
+
+def test_author_feed(client, user, visible_post):
+    response = client.get(f"/profile/{user.username}/rss/")
+    assert visible_post.title in response.content.decode()
+
+
+def test_unpublished_category_feed_is_not_found(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    response = client.get(f"/category/{category.slug}/rss/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_polling_is_cached_and_conditional(
+    client, published_category, visible_post
+):
+    url = f"/category/{published_category.slug}/rss/"
+    response = client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        repeated = client.get(url)
+        cached = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeated.content == response.content
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    blog_queries = [q for q in queries if "blog_post" in q["sql"]]
+    assert not blog_queries
+
+
+def test_post_change_regenerates_feed(
+    client, mixer, user, published_category, another_category, visible_post
+):
+    url = f"/category/{published_category.slug}/rss/"
+    response = client.get(url)
+    visible_post.title = "Новый заголовок"
+    visible_post.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert changed.status_code == HTTPStatus.OK
+    assert "Новый заголовок" in changed.content.decode()
+
+    visible_post.category = another_category
+    visible_post.save()
+    assert "Новый заголовок" not in client.get(url).content.decode()
+
+
+def test_feed_is_cached_per_host_and_scheme(client, user, visible_post):
+    url = f"/profile/{user.username}/rss/"
+    plain = client.get(url).content.decode()
+    other_host = client.get(url, HTTP_HOST="127.0.0.1").content.decode()
+    secure = client.get(url, secure=True).content.decode()
+    assert "http://testserver/" in plain
+    assert "http://127.0.0.1/" in other_host
+    assert "https://testserver/" in secure
+
+
+def test_anonymous_feed_has_only_excerpts(
+    client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        text=" ".join(["начало"] * 10 + ["продолжение"] * 30),
+    )
+    response = client.get(f"/category/{published_category.slug}/rss/")
+    assert response.status_code == HTTPStatus.OK
+    assert "public" in response["Cache-Control"]
+    content = response.content.decode()
+    assert post.title in content
+    assert f"/posts/{post.pk}/" in content
+    assert "начало" in content
+    assert "продолжение" not in content